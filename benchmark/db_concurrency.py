@@ -0,0 +1,106 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from tortoise import Tortoise
+from tortoise.functions import Count
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model.posts import Post
+from src.model.users import User
+from src.tools.database import MODELS, tortoise_config
+
+
+async def seed(rows: int) -> None:
+    await Tortoise.generate_schemas()
+    users = [await User.create(username=f"u{i}", login_id=f"u{i}", hash_password="-") for i in range(10)]
+    first_day = date(2020, 1, 1)
+    await Post.bulk_create(
+        [
+            Post(author=users[i % len(users)], title=f"title {i}", date=first_day + timedelta(days=i // 30), content="content " * 20)
+            for i in range(rows)
+        ],
+        batch_size=5000,
+    )
+
+
+# 달력 화면과 같은 모양의 읽기 (유저의 한 달치 글을 날짜별로 묶기)
+async def read_once(user_id: int, month_index: int) -> None:
+    first_day = date(2020, 1, 1) + timedelta(days=30 * (month_index % 100))
+    await (
+        Post.filter(author_id=user_id, date__gte=first_day, date__lt=first_day + timedelta(days=30))
+        .annotate(count=Count("id"))
+        .group_by("date")
+        .values_list("date", "count")
+    )
+
+
+async def write_once(user_id: int, serial: int) -> None:
+    await Post.create(author_id=user_id, title=f"bench {serial}", date=date(2030, 1, 1), content="content")
+
+
+async def workload(readers: int, writers: int, seconds: float) -> dict:
+    stop_at = time.perf_counter() + seconds
+    read_latencies, write_latencies = [], []
+
+    async def reader(index: int) -> None:
+        while time.perf_counter() < stop_at:
+            started = time.perf_counter()
+            await read_once(index % 10 + 1, len(read_latencies))
+            read_latencies.append(time.perf_counter() - started)
+
+    async def writer(index: int) -> None:
+        while time.perf_counter() < stop_at:
+            started = time.perf_counter()
+            await write_once(index % 10 + 1, len(write_latencies))
+            write_latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(reader(i) for i in range(readers)), *(writer(i) for i in range(writers)))
+    return {
+        "reads/s": len(read_latencies) / seconds,
+        "writes/s": len(write_latencies) / seconds,
+        "read p95 ms": _p95(read_latencies),
+        "write p95 ms": _p95(write_latencies),
+    }
+
+
+def _p95(latencies) -> float:
+    if not latencies:
+        return 0.0
+    return sorted(latencies)[int(len(latencies) * 0.95)] * 1000
+
+
+async def run(rows: int, readers: int, writers: int, seconds: float, read_connections: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite://{tmp}/bench.sqlite3"
+        await Tortoise.init(db_url=db_url, modules={"models": MODELS})
+        await seed(rows)
+        await Tortoise.close_connections()
+
+        print(f"posts={rows:,}, readers={readers}, writers={writers}, {seconds:.0f}s per mode, cpus={os.cpu_count()}")
+        modes = [
+            ("before: single connection", {"db_url": db_url, "modules": {"models": MODELS}}),
+            (f"after: pragmas + {read_connections} readers", {"config": tortoise_config(db_url, MODELS, read_connections)}),
+        ]
+        for label, init_kwargs in modes:
+            await Tortoise.init(**init_kwargs)
+            result = await workload(readers, writers, seconds)
+            await Tortoise.close_connections()
+            print(f"  {label:<32} " + "  ".join(f"{key} {value:8.1f}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SQLite 동시 읽기/쓰기 처리량: 연결 하나 vs WAL PRAGMA + 읽기 연결 분리")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--read-connections", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.readers, args.writers, args.seconds, args.read_connections))
@@ -0,0 +1,75 @@
+import argparse
+import asyncio
+import os
+import sys
+from datetime import date
+
+from tortoise import Tortoise
+from tortoise.expressions import Q
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import database_url
+from src.model.bookmarks import Bookmark
+from src.model.posts import Post
+from src.model.questions import Question
+from src.model.quotes import Quote
+from src.model.users import User
+from src.tools.database import MODELS
+from src.tools.migrate import migrate
+from src.tools.sql_functions import GroupConcat
+
+USER_ID = 1
+TARGET_DATE = date(2025, 1, 1)
+
+
+def router_queries() -> dict:
+    """라우터들이 실행하는 쿼리와 같은 모양의 쿼리셋 (라우터를 수정하면 여기도 같이 맞춰주세요)"""
+    return {
+        "users.login": User.filter(login_id="someone"),
+        "jwt.get_current_user": User.filter(id=USER_ID).limit(1),
+        "users.get_calender": Post.filter(author_id=USER_ID, date__gte=TARGET_DATE, date__lte=TARGET_DATE)
+        .annotate(post_ids=GroupConcat("id"))
+        .group_by("date")
+        .order_by("date")
+        .values_list("date", "post_ids"),
+        "posts.get_my_posts": Post.filter(author_id=USER_ID).offset(100).limit(10).order_by("date", "id"),
+        "posts.get_my_posts_by_cursor": Post.filter(author_id=USER_ID)
+        .filter(date__gte=TARGET_DATE)
+        .filter(Q(date__gt=TARGET_DATE) | Q(id__gt=10))
+        .order_by("date", "id")
+        .limit(11),
+        "posts.get_posts_by_week": Post.filter(author_id=USER_ID)
+        .filter(date__gte=TARGET_DATE, date__lte=TARGET_DATE)
+        .order_by("date"),
+        "posts.get_my_post": Post.filter(id=1, author_id=USER_ID),
+        "quotes.get_random_quote": Quote.filter(id=1),
+        "quotes.bookmark_quote": Bookmark.filter(user_id=USER_ID, quote_id=1),
+        "quotes.get_bookmarked_quotes": Bookmark.filter(user_id=USER_ID),
+        "questions.get_random_question": Question.filter(id=1),
+    }
+
+
+async def run(db_url: str) -> None:
+    await Tortoise.init(db_url=db_url, modules={"models": MODELS})
+    await migrate()
+    conn = Tortoise.get_connection("default")
+
+    for name, queryset in router_queries().items():
+        sql = queryset.sql(params_inline=True)
+        rows = await conn.execute_query_dict(f"EXPLAIN QUERY PLAN {sql}")
+        print(f"[{name}]")
+        print(f"  {sql}")
+        for row in rows:
+            print(f"  -> {row['detail']}")
+        print()
+
+    await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="라우터 쿼리들의 EXPLAIN QUERY PLAN 출력 (SQLite)")
+    parser.add_argument("--db", default=database_url, help="확인할 DB 주소 (기본값: config.database_url)")
+    args = parser.parse_args()
+    asyncio.run(run(args.db))
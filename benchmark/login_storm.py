@@ -0,0 +1,96 @@
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite://{_tmp.name}/bench.sqlite3"
+# 새 임시 DB 라서 lifespan 의 버전 확인 대신 마이그레이션까지 적용
+os.environ["MIGRATE_ON_STARTUP"] = "true"
+os.environ.setdefault("JWT_SECRET_KEY", "bench")
+
+import httpx
+
+from main import app
+from src.model.users import User
+
+LOGIN_ID = "storm"
+PASSWORD = "password"
+
+
+async def _inline_verify(self: User, password: str) -> bool:
+    # 기존 방식: 이벤트 루프 위에서 바로 해시 계산
+    return self.verify_password(password)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def storm(client: httpx.AsyncClient, logins: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_login():
+        async with semaphore:
+            response = await client.post("/api/v1/users/login", data={"username": LOGIN_ID, "password": PASSWORD})
+            response.raise_for_status()
+
+    await asyncio.gather(*(one_login() for _ in range(logins)))
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event, interval: float = 0.005) -> list[float]:
+    # 로그인과 상관없는 엔드포인트를 일정 간격으로 호출. 루프가 막혀서 늦게 출발한 시간도
+    # 지연에 포함되도록 "원래 보냈어야 할 시각" 부터 응답까지를 잰다.
+    latencies = []
+    scheduled = time.perf_counter()
+    while not stop.is_set():
+        await client.get("/health")
+        latencies.append((time.perf_counter() - scheduled) * 1000)
+        scheduled = max(scheduled + interval, time.perf_counter())
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+    return latencies
+
+
+async def measure(client: httpx.AsyncClient, label: str, logins: int, concurrency: int) -> None:
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(client, stop))
+    started = time.perf_counter()
+    await storm(client, logins, concurrency)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    latencies = await probe_task
+    print(
+        f"  {label:<8} logins/s={logins / elapsed:7.1f}  /health p50={statistics.median(latencies):7.2f} ms"
+        f"  p99={percentile(latencies, 99):7.2f} ms  max={max(latencies):7.2f} ms  (n={len(latencies)})"
+    )
+
+
+async def run(logins: int, concurrency: int) -> None:
+    async with app.router.lifespan_context(app):
+        user = User(username=LOGIN_ID, login_id=LOGIN_ID)
+        user.set_password(PASSWORD)
+        await user.save()
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            print(f"{logins} logins, {concurrency} concurrent")
+            original = User.verify_password_async
+            User.verify_password_async = _inline_verify
+            await measure(client, "before", logins, concurrency)
+            User.verify_password_async = original
+            await measure(client, "after", logins, concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로그인 폭주 중 다른 엔드포인트 지연시간 (p99) 비교")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(run(args.logins, args.concurrency))
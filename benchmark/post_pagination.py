@@ -0,0 +1,81 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from tortoise import Tortoise
+from tortoise.expressions import Q
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model.posts import Post
+from src.model.users import User
+from src.tools.database import MODELS
+
+BATCH_SIZE = 10_000
+LIMIT = 10
+
+
+async def seed(rows: int) -> User:
+    user = await User.create(username="bench", login_id="bench", hash_password="-")
+    # 다른 유저의 글도 섞어서 author 필터가 의미 있도록 함
+    other = await User.create(username="other", login_id="other", hash_password="-")
+    first_day = date(2000, 1, 1)
+    for start in range(0, rows, BATCH_SIZE):
+        posts = []
+        for i in range(start, min(start + BATCH_SIZE, rows)):
+            day = first_day + timedelta(days=i // 3)
+            posts.append(Post(author=user, title=f"title {i}", date=day, content="content"))
+            posts.append(Post(author=other, title=f"title {i}", date=day, content="content"))
+        await Post.bulk_create(posts)
+    return user
+
+
+async def offset_page(user: User, page: int):
+    return await Post.filter(author=user).offset((page - 1) * LIMIT).limit(LIMIT).order_by("date", "id")
+
+
+async def cursor_page(user: User, last_date, last_id):
+    query = Post.filter(author=user)
+    if last_date is not None:
+        query = query.filter(date__gte=last_date).filter(Q(date__gt=last_date) | Q(id__gt=last_id))
+    return await query.order_by("date", "id").limit(LIMIT + 1)
+
+
+async def measure(label: str, func, iterations: int) -> None:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await func()
+    per_call = (time.perf_counter() - started) / iterations * 1000
+    print(f"  {label:<22} {per_call:8.3f} ms/page")
+
+
+async def run(rows: int, deep_page: int, iterations: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        await Tortoise.init(db_url=f"sqlite://{tmp}/bench.sqlite3", modules={"models": MODELS})
+        await Tortoise.generate_schemas()
+        user = await seed(rows)
+
+        # 깊은 페이지 직전 글의 (date, id) 를 구해두고 커서로 사용
+        anchor = (await offset_page(user, deep_page - 1))[-1]
+
+        print(f"posts per user={rows:,}, limit={LIMIT}")
+        await measure("offset page 1", lambda: offset_page(user, 1), iterations)
+        await measure(f"offset page {deep_page:,}", lambda: offset_page(user, deep_page), iterations)
+        await measure("cursor page 1", lambda: cursor_page(user, None, None), iterations)
+        await measure(f"cursor page {deep_page:,}", lambda: cursor_page(user, anchor.date, anchor.id), iterations)
+
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="게시글 목록: OFFSET vs (date, id) 커서 페이지네이션 비교")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--page", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.page, args.iterations))
@@ -0,0 +1,98 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from tortoise import Tortoise
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model.posts import Post
+from src.model.users import User
+from src.router.posts import POST_OUT_FIELDS, PostOut
+from src.tools.database import MODELS
+from src.tools.responses import FastJSONResponse
+
+CONTENT = "오늘은 공원에서 오래 걸었다. 바람이 선선해서 기분이 좋았다. " * 8
+
+
+async def seed(rows: int) -> User:
+    user = await User.create(username="bench", login_id="bench", hash_password="-")
+    first_day = date(2000, 1, 1)
+    await Post.bulk_create(
+        [Post(author=user, title=f"title {i}", date=first_day + timedelta(days=i), content=CONTENT) for i in range(rows)]
+    )
+    return user
+
+
+# 기존 경로: ORM 객체 -> PostOut (pydantic_model_creator) -> response_model 검증/직렬화 -> json 인코딩
+async def orm_path(user: User, limit: int, field) -> bytes:
+    posts = await PostOut.from_queryset(Post.filter(author=user).limit(limit).order_by("date", "id"))
+    content = await serialize_response(field=field, response_content=posts)
+    return JSONResponse(content).body
+
+
+# 빠른 경로: .values() dict -> orjson 한 번
+async def values_path(user: User, limit: int) -> bytes:
+    rows = await Post.filter(author=user).limit(limit).order_by("date", "id").values(*POST_OUT_FIELDS)
+    return FastJSONResponse(rows).body
+
+
+async def measure(label: str, func, limit: int, iterations: int) -> float:
+    await func()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await func()
+    per_item = (time.perf_counter() - started) / iterations / limit * 1_000_000
+    print(f"  {label:<28} {per_item:8.2f} us/item")
+    return per_item
+
+
+async def run(limit: int, iterations: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        await Tortoise.init(db_url=f"sqlite://{tmp}/bench.sqlite3", modules={"models": MODELS})
+        await Tortoise.generate_schemas()
+        user = await seed(limit)
+        field = create_model_field(name="Response_get_my_posts", type_=List[PostOut], mode="serialization")
+
+        # 두 경로가 같은 JSON 을 만드는지 먼저 확인
+        assert json.loads(await orm_path(user, limit, field)) == json.loads(await values_path(user, limit))
+
+        print(f"posts per page={limit}, iterations={iterations} (query + serialization)")
+        before = await measure("ORM + pydantic + json", lambda: orm_path(user, limit, field), limit, iterations)
+        after = await measure(".values() + orjson", lambda: values_path(user, limit), limit, iterations)
+        print(f"  speedup                      {before / after:8.2f}x")
+
+        # 조회는 빼고 이미 가져온 데이터의 직렬화 비용만
+        posts = await PostOut.from_queryset(Post.filter(author=user).limit(limit).order_by("date", "id"))
+        rows = await Post.filter(author=user).limit(limit).order_by("date", "id").values(*POST_OUT_FIELDS)
+
+        async def serialize_models():
+            return JSONResponse(await serialize_response(field=field, response_content=posts)).body
+
+        async def serialize_rows():
+            return FastJSONResponse(rows).body
+
+        print("serialization only")
+        before = await measure("pydantic validate + json", serialize_models, limit, iterations)
+        after = await measure("orjson", serialize_rows, limit, iterations)
+        print(f"  speedup                      {before / after:8.2f}x")
+
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="게시글 목록 응답 직렬화 비용: ORM/pydantic 경로 vs .values() + orjson")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.limit, args.iterations))
@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+from tortoise import Tortoise
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model.quotes import Quote
+from src.tools.database import MODELS
+from src.tools.id_pool import IdPool
+
+BATCH_SIZE = 10_000
+
+
+async def seed(rows: int) -> None:
+    for start in range(0, rows, BATCH_SIZE):
+        await Quote.bulk_create(
+            [Quote(author=f"author {i}", message=f"message {i}") for i in range(start, min(start + BATCH_SIZE, rows))]
+        )
+
+
+async def pick_with_offset() -> Quote:
+    # 기존 방식: COUNT(*) + OFFSET 스캔
+    total = await Quote.all().count()
+    idx = random.randrange(total)
+    result = await Quote.all().offset(idx).limit(1)
+    return result[0]
+
+
+async def measure(label: str, func, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await func()
+    elapsed = time.perf_counter() - started
+    per_call = elapsed / iterations * 1000
+    print(f"  {label:<12} {per_call:8.3f} ms/call")
+    return per_call
+
+
+async def run(sizes: list[int], iterations: int) -> None:
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            await Tortoise.init(db_url=f"sqlite://{tmp}/bench.sqlite3", modules={"models": MODELS})
+            await Tortoise.generate_schemas()
+            await seed(rows)
+
+            pool = IdPool(Quote)
+            started = time.perf_counter()
+            await pool.refresh()
+            load_ms = (time.perf_counter() - started) * 1000
+
+            print(f"rows={rows:,} (pool load {load_ms:.1f} ms)")
+            offset_ms = await measure("count+offset", pick_with_offset, iterations)
+            pool_ms = await measure("id pool", pool.pick, iterations)
+            print(f"  speedup      {offset_ms / pool_ms:8.1f}x")
+
+            await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="랜덤 명언 선택: COUNT+OFFSET vs id 풀 비교")
+    parser.add_argument("--sizes", default="10000,1000000", help="쉼표로 구분한 row 수")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run([int(size) for size in args.sizes.split(",")], args.iterations))
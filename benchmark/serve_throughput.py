@@ -0,0 +1,153 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 로그인 없이 부를 수 있는 DB 조회 엔드포인트 위주로 섞어서 호출
+PATHS = ["/api/v1/quotes/", "/api/v1/quotes/search?q=life&limit=10", "/api/v1/questions/", "/health"]
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def prepare_database(path: str, quotes: int, env: dict) -> None:
+    subprocess.run([sys.executable, "-m", "src.tools.migrate"], cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        'INSERT INTO "quote" ("message", "author") VALUES (?, ?)',
+        [(f"quote {i} about life and work", f"author {i % 200}") for i in range(quotes)],
+    )
+    conn.executemany('INSERT INTO "question" ("message") VALUES (?)', [(f"question {i}?",) for i in range(365)])
+    conn.commit()
+    conn.close()
+
+
+def start_server(workers: int, port: int, env: dict) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "main.py"],
+        cwd=ROOT,
+        env={**env, "WEB_WORKERS": str(workers), "PORT": str(port), "HOST": "127.0.0.1"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            response = httpx.get(f"http://127.0.0.1:{port}/health", timeout=1)
+            ready = [worker for worker in response.json()["worker"].get("workers", []) if worker["ready"]]
+            if len(ready) >= workers:
+                return server
+        except (httpx.HTTPError, KeyError, ValueError):
+            pass
+        time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("server did not become ready")
+
+
+async def _client(port: int, seconds: float, concurrency: int) -> tuple[list[float], int]:
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=10) as client:
+
+        async def loop(offset: int) -> None:
+            nonlocal errors
+            index = offset
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(PATHS[index % len(PATHS)])
+                    if response.status_code == 200:
+                        latencies.append((time.perf_counter() - started) * 1000)
+                    else:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                index += 1
+
+        await asyncio.gather(*(loop(offset) for offset in range(concurrency)))
+    return latencies, errors
+
+
+def _client_process(port: int, seconds: float, concurrency: int, results) -> None:
+    results.put(asyncio.run(_client(port, seconds, concurrency)))
+
+
+def load(port: int, clients: int, concurrency: int, seconds: float, restart_pid: int = 0) -> tuple[list[float], int]:
+    """clients 개 프로세스가 각각 concurrency 개 연결로 seconds 동안 호출. restart_pid 가 있으면 중간에 SIGHUP."""
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_client_process, args=(port, seconds, concurrency, results)) for _ in range(clients)
+    ]
+    for process in processes:
+        process.start()
+    if restart_pid:
+        time.sleep(seconds / 4)
+        os.kill(restart_pid, signal.SIGHUP)
+    latencies: list[float] = []
+    errors = 0
+    for _ in processes:
+        client_latencies, client_errors = results.get()
+        latencies.extend(client_latencies)
+        errors += client_errors
+    for process in processes:
+        process.join()
+    return latencies, errors
+
+
+def run(worker_counts: list[int], clients: int, concurrency: int, seconds: float, quotes: int, restart: bool) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.sqlite3")
+        env = {**os.environ, "DATABASE_URL": f"sqlite://{path}", "JWT_SECRET_KEY": "bench", "DEBUG_MODE": "false"}
+        prepare_database(path, quotes, env)
+        print(f"cpus={os.cpu_count()}, {clients} client processes x {concurrency} connections, {seconds:.0f}s per run")
+        baseline = None
+        for workers in worker_counts:
+            port = _free_port()
+            server = start_server(workers, port, env)
+            try:
+                latencies, errors = load(port, clients, concurrency, seconds)
+                throughput = len(latencies) / seconds
+                baseline = baseline or throughput
+                print(
+                    f"  workers={workers:<3} req/s={throughput:8.1f} (x{throughput / baseline:.2f})"
+                    f"  p50={percentile(latencies, 50):6.1f} ms  p99={percentile(latencies, 99):6.1f} ms  errors={errors}"
+                )
+                if restart:
+                    latencies, errors = load(port, clients, concurrency, seconds, restart_pid=server.pid)
+                    print(f"    with rolling restart (SIGHUP): ok={len(latencies)} errors={errors}")
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="prefork 워커 수에 따른 처리량 (python main.py 를 실제로 띄워서 측정)")
+    parser.add_argument("--workers", default=f"1,{max(os.cpu_count() or 1, 2)}", help="쉼표로 구분한 워커 수 목록")
+    parser.add_argument("--clients", type=int, default=max((os.cpu_count() or 1) // 2, 1), help="부하 생성 프로세스 수")
+    parser.add_argument("--concurrency", type=int, default=16, help="부하 생성 프로세스당 동시 연결 수")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--quotes", type=int, default=20000)
+    parser.add_argument("--restart", action="store_true", help="부하 중 SIGHUP 을 보내서 교체 중 실패한 요청 수도 확인")
+    args = parser.parse_args()
+    run([int(count) for count in args.workers.split(",")], args.clients, args.concurrency, args.seconds, args.quotes, args.restart)
@@ -9,4 +9,22 @@ storage_path = os.environ.get("STORAGE_PATH", "./storage")
 database_url = os.environ.get("DATABASE_URL", "sqlite://db.sqlite3") # DB 주소 연결해주세요 (테스트는 기본주소 대응가능)
 debug_mode = os.environ.get("DEBUG_MODE", "false").lower() == "true"
 host = os.environ.get("HOST", "0.0.0.0")
-port = int(os.environ.get("PORT", "8000"))
\ No newline at end of file
+port = int(os.environ.get("PORT", "8000"))
+id_pool_ttl = int(os.environ.get("ID_POOL_TTL_SECONDS", "300")) # 랜덤 명언/질문 id 풀 재로딩 주기
+token_cache_size = int(os.environ.get("TOKEN_CACHE_SIZE", "10000")) # 검증된 토큰/유저 캐시 최대 개수 (0 이면 끔)
+token_cache_ttl = int(os.environ.get("TOKEN_CACHE_TTL_SECONDS", "60")) # 토큰 exp 보다 짧으면 이 값이 우선
+token_cache_worker_ttl = int(os.environ.get("TOKEN_CACHE_WORKER_TTL_SECONDS", "5")) # 워커가 여러 개일 때의 TTL 상한 (다른 워커에서 바뀐 유저 정보가 늦어도 이 시간 안에 반영됨)
+max_image_size = int(os.environ.get("MAX_IMAGE_SIZE_BYTES", str(10 * 1024 * 1024))) # 업로드 이미지 최대 크기 (기본 10MB)
+image_chunk_size = int(os.environ.get("IMAGE_CHUNK_SIZE_BYTES", str(64 * 1024))) # 업로드를 디스크에 옮겨 쓸 때 청크 크기
+image_workers = int(os.environ.get("IMAGE_WORKERS", "2")) # 썸네일 생성 프로세스 풀 크기
+password_hash_workers = int(os.environ.get("PASSWORD_HASH_WORKERS", "2")) # 비밀번호 해시 전용 스레드 수
+password_hash_concurrency = int(os.environ.get("PASSWORD_HASH_CONCURRENCY", "4")) # 동시에 처리할 해시 작업 수 (나머지는 대기)
+db_read_connections = int(os.environ.get("DB_READ_CONNECTIONS") or min(max((os.cpu_count() or 1) - 1, 0), 4)) # SQLite 읽기 전용 연결 수 (0 이면 쓰기 연결 하나로 모두 처리, 비워두면 기본값인 코어 수 - 1, 최대 4)
+sqlite_busy_timeout = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000")) # 잠금 대기 시간
+sqlite_cache_size = int(os.environ.get("SQLITE_CACHE_SIZE_KB", str(32 * 1024))) # 연결마다의 페이지 캐시 크기
+sqlite_mmap_size = int(os.environ.get("SQLITE_MMAP_SIZE_BYTES", str(256 * 1024 * 1024))) # 메모리 맵으로 읽을 최대 크기
+migrate_on_startup = os.environ.get("MIGRATE_ON_STARTUP", "false").lower() == "true" # 서버 시작 때 마이그레이션까지 적용 (기본은 버전 확인만, python -m src.tools.migrate 로 적용)
+web_workers = int(os.environ.get("WEB_WORKERS") or os.cpu_count() or 1) # python main.py 로 띄울 워커 프로세스 수 (비워두면 코어 수, DEBUG_MODE 면 reload 되는 단일 프로세스)
+worker_timeout = int(os.environ.get("WORKER_TIMEOUT_SECONDS", "30")) # 이 시간 안에 준비/heartbeat 가 없는 워커는 죽이고 새로 띄움
+worker_graceful_timeout = int(os.environ.get("WORKER_GRACEFUL_TIMEOUT_SECONDS", "30")) # 종료/교체 때 처리 중인 요청을 기다리는 시간
+slow_request_ms = int(os.environ.get("SLOW_REQUEST_MS", "500")) # 이 시간보다 오래 걸린 요청은 실행한 쿼리 목록과 함께 로그 (0 이면 끔)
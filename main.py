@@ -1,41 +1,129 @@
+# 다른 모듈보다 먼저 불러와서 import 시간부터 측정
+from src.tools.startup import FirstRequestTimer, startup_report
+
+import asyncio
+import contextlib
+
 import uvicorn
 from tortoise import Tortoise
 
 from fastapi import FastAPI
+from fastapi.responses import Response
 
-from config import database_url, host, port, debug_mode
-from src.router.static import router as static_router
+from config import database_url, host, port, debug_mode, migrate_on_startup, web_workers
+from src.router.static import router as static_router, manifest as static_manifest, STATIC_ROOT
 from src.router.users import router as user_router
 from src.router.quotes import router as quotes_router
 from src.router.questions import router as questions_router
 from src.router.posts import router as posts_router
+from src.router.home import router as home_router
+from src.tools.database import MODELS, tortoise_config
+from src.tools.hashing import hash_pool
+from src.tools.id_pool import load_pools
+from src.tools.metrics import PROMETHEUS_CONTENT_TYPE, MetricsMiddleware, instrument_db, publish_loop, render_metrics
+from src.tools.migrate import check_schema, migrate
+from src.tools.prefork import heartbeat, is_worker, mark_ready, serve, worker_stats
+from src.tools.thumbnail import shutdown_derivative_pool
+from src.tools.token_cache import token_cache
 
-MODELS = ["src.model.users", "src.model.posts", "src.model.quotes", "src.model.questions", "src.model.bookmarks"]
-ROUTERS = [user_router, quotes_router, questions_router, posts_router]
+ROUTERS = [user_router, quotes_router, questions_router, posts_router, home_router]
 STATIC_ROUTER = static_router
 
+async def prepare_schema() -> None:
+    # 스키마 생성/변경은 배포 때 python -m src.tools.migrate 로 한 번만 하고, 여기서는 버전만 확인
+    if migrate_on_startup:
+        await migrate()
+    else:
+        await check_schema()
+
+# prefork 마스터에서 워커를 fork 하기 전에 한 번 실행. 여기서 만든 데이터는 워커들이 copy-on-write 로 공유
+def preload() -> None:
+    async def load() -> None:
+        await Tortoise.init(config=tortoise_config(database_url, MODELS))
+        try:
+            await prepare_schema()
+            await load_pools()
+        finally:
+            await Tortoise.close_connections()
+
+    asyncio.run(load())
+    static_manifest.build()
+    startup_report.mark("preload")
+
 # 앱 수명 주기 설정
 async def lifespan(app: FastAPI):
-    # 데이터베이스 초기화
-    await Tortoise.init(db_url=database_url, modules={"models": MODELS})
-    await Tortoise.generate_schemas() # DB 스키마 생성
+    if is_worker():
+        startup_report.forked()
+    # 데이터베이스 초기화 (연결은 프로세스마다 따로 열어야 하므로 워커도 여기서 엶)
+    # SQLite 면 WAL/PRAGMA 적용 + 읽기 전용 연결 분리 (src/tools/database.py)
+    await Tortoise.init(config=tortoise_config(database_url, MODELS))
+    instrument_db() # 요청별 쿼리 수/DB 시간 측정
+    startup_report.mark("database")
+    # prefork 워커는 마스터가 이미 스키마를 확인했으므로 건너뜀
+    if not is_worker():
+        try:
+            await prepare_schema()
+        except RuntimeError:
+            # 연결 스레드가 남아 있으면 프로세스가 종료되지 않음
+            await Tortoise.close_connections()
+            raise
+        startup_report.mark("schema")
+    await load_pools(only_missing=True) # 랜덤 명언/질문용 id 풀 로딩
+    startup_report.mark("id_pools")
+    static_manifest.ensure_loaded() # 정적 파일 목록/ETag 미리 계산
+    startup_report.mark("static_manifest")
+    background = []
+    # 개발 모드에서는 정적 파일이 바뀌면 매니페스트 다시 생성
+    if debug_mode:
+        background.append(asyncio.create_task(static_manifest.watch(STATIC_ROOT)))
+    # prefork 워커는 마스터가 멈춘 워커를 알아챌 수 있도록 heartbeat 를 남기고,
+    # 어느 워커가 /metrics 를 받아도 합칠 수 있도록 지표를 공유 디렉토리에 씀
+    if is_worker():
+        background.append(asyncio.create_task(heartbeat()))
+        background.append(asyncio.create_task(publish_loop()))
+    mark_ready()
+    startup_report.mark_ready()
     yield
+    for task in background:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    # 진행 중인 썸네일 작업 마무리 후 프로세스 풀 종료
+    await shutdown_derivative_pool()
+    hash_pool.shutdown()
     # 데이터베이스 연결 종료
     await Tortoise.close_connections()
 
 # app 인스턴스 생성
 app = FastAPI(lifespan=lifespan)
 
+# 헬스체크 엔드포인트 (정적 catch-all 라우터보다 먼저 등록해야 가려지지 않음)
+@app.get("/health")
+async def health_check():
+    return {
+        "status": "ok",
+        "token_cache": token_cache.stats(),
+        "password_hash": hash_pool.stats(),
+        "startup": startup_report.stats(),
+        "worker": worker_stats(),
+    }
+
+# Prometheus 수집용 지표 (라우트별 응답 시간, 요청당 쿼리 수/DB 시간, 처리 중인 요청 수)
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
 # 라우터 등록
 for router in ROUTERS:
     app.include_router(router)
 app.include_router(STATIC_ROUTER)
-
-
-# 헬스체크 엔드포인트
-@app.route("/health")
-async def health_check():
-    return {"status": "ok"}
+app.add_middleware(FirstRequestTimer, report=startup_report)
+app.add_middleware(MetricsMiddleware)
+startup_report.mark("imports")
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host=host, port=port, reload=debug_mode)
\ No newline at end of file
+    if debug_mode:
+        uvicorn.run("main:app", host=host, port=port, reload=True)
+    else:
+        # 공유 데이터를 만든 뒤 WEB_WORKERS 개 워커를 fork (src/tools/prefork.py)
+        serve(app, preload=preload, workers=web_workers, host=host, port=port)
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""
+quotes_scraping.py 를 실제 사이트 대신 돌려볼 수 있는 로컬 테스트 서버.
+
+    python scraping/fixture_server.py --port 8765
+    python scraping/quotes_scraping.py --base-url "http://127.0.0.1:8765/view/?no=" --start 1 --end 50 --rate 50 --burst 10
+
+글 번호 % 3 에 따라 명언 / 다른 작성자 / 삭제된 글 페이지를 돌려주고,
+--fail-rate 로 일부 요청을 500 으로 실패시켜 재시도와 이어받기를 확인할 수 있다.
+"""
+import argparse
+import random
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+PAGES = {
+    0: (FIXTURE_DIR / "deleted_post.html").read_text(encoding="utf-8"),
+    1: (FIXTURE_DIR / "quote_post.html").read_text(encoding="utf-8"),
+    2: (FIXTURE_DIR / "other_author_post.html").read_text(encoding="utf-8"),
+}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    fail_rate = 0.0
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        try:
+            post_no = int(query.get("no", [""])[0])
+        except ValueError:
+            self.send_error(400)
+            return
+        if random.random() < self.fail_rate:
+            self.send_error(500)
+            return
+        body = PAGES[post_no % 3].replace("{post_no}", str(post_no)).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="스크래퍼용 로컬 테스트 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="500 으로 실패시킬 요청 비율 (0~1)")
+    args = parser.parse_args()
+    FixtureHandler.fail_rate = args.fail_rate
+    server = ThreadingHTTPServer((args.host, args.port), FixtureHandler)
+    print(f"Serving fixtures on http://{args.host}:{args.port}/view/?no=")
+    server.serve_forever()
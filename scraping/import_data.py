@@ -1,65 +1,94 @@
+import argparse
 import asyncio
+import csv
 import os
 import sys
+from typing import Dict, Iterator
+
+from openpyxl import load_workbook
 from tortoise import Tortoise
-import pandas as pd
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import database_url
 from src.model.quotes import Quote
+from src.tools.bulk_import import bulk_insert_missing
+from src.tools.database import MODELS, tortoise_config
+from src.tools.migrate import migrate
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DB_PATH = os.path.join(PROJECT_ROOT, 'db.sqlite3')
+QUOTES_FILE_PATH = os.path.join(PROJECT_ROOT, 'data', 'quotes.xlsx')
+
+# 파일 헤더 -> 모델 필드 매핑 (quotes.xlsx 는 author/message, 스크래퍼 CSV 는 quote/author)
+XLSX_QUOTE_MAPPING = {'author': 'author', 'message': 'message'}
+CSV_QUOTE_MAPPING = {'author': 'author', 'message': 'quote'}
+
+
+def _clean(value) -> str:
+    return "" if value is None else str(value).strip()
 
-# 2. database_url을 절대 경로를 사용하도록 재정의합니다.
-# Tortoise ORM의 SQLite URL 형식에 맞춥니다.
-database_url = f"sqlite://{DB_PATH}"
-print(f"Database URL set to: {database_url}")
 
-MODELS = ["src.model.users", "src.model.posts", "src.model.quotes", "src.model.questions", "src.model.bookmarks"]
+def read_xlsx(filepath: str, field_mapping: Dict[str, str]) -> Iterator[dict]:
+    """openpyxl read-only 모드로 한 줄씩 읽는다 (시트 전체를 메모리에 올리지 않음)."""
+    workbook = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [_clean(cell) for cell in next(rows, ())]
+        columns = {field: header.index(column) for field, column in field_mapping.items()}
+        for row in rows:
+            yield {field: _clean(row[index]) if index < len(row) else "" for field, index in columns.items()}
+    finally:
+        workbook.close()
 
-async def import_from_xlsx(model, filepath: str, field_mapping: dict):
+
+def read_csv(filepath: str, field_mapping: Dict[str, str]) -> Iterator[dict]:
+    # 스크래퍼가 이어쓰기(a 모드)로 만든 CSV 는 중간에 헤더 줄이 반복될 수 있음
+    with open(filepath, newline='', encoding='utf-8-sig') as csv_file:
+        reader = csv.DictReader(csv_file)
+        for row in reader:
+            record = {field: _clean(row.get(column)) for field, column in field_mapping.items()}
+            if all(record[field] == column for field, column in field_mapping.items()):
+                continue
+            yield record
+
+
+async def import_quotes(filepath: str, batch_size: int = 1000) -> None:
     """
-    XLSX 파일로부터 데이터를 읽어 DB에 저장하는 범용 함수
-    :param model: Tortoise ORM 모델 클래스
-    :param filepath: XLSX 파일 경로
-    :param field_mapping: XLSX 헤더와 모델 필드를 매핑하는 딕셔너리
+    XLSX/CSV 파일의 명언을 스트리밍으로 읽어 중복을 제외하고 bulk insert 한다.
+    :param filepath: .xlsx 또는 .csv 파일 경로
+    :param batch_size: 한 트랜잭션에 넣을 row 수
     """
-    print(f"Importing data for {model.__name__} from {filepath}...")
-    created_count = 0
+    print(f"Importing data for Quote from {filepath}...")
     if not os.path.exists(filepath):
         print(f"File not found: {filepath}")
         return
 
-    df = pd.read_excel(filepath)
-    # NaN 값을 빈 문자열로 대체
-    df = df.fillna('')
-
-    for index, row in df.iterrows():
-        data_to_create = {model_field: row[xlsx_header] for model_field, xlsx_header in field_mapping.items()}
+    if filepath.lower().endswith(".csv"):
+        records = read_csv(filepath, CSV_QUOTE_MAPPING)
+    else:
+        records = read_xlsx(filepath, XLSX_QUOTE_MAPPING)
+    # 본문이 빈 줄은 명언으로 쓸 수 없으므로 제외
+    records = (record for record in records if record['message'])
 
-        # get_or_create를 사용하여 중복 데이터 방지
-        _, created = await model.get_or_create(**data_to_create)
-        if created:
-            created_count += 1
+    stats = await bulk_insert_missing(Quote, records, key_fields=('author', 'message'), batch_size=batch_size)
+    print(f"Finished importing for Quote. {stats}")
 
-    print(f"Finished importing for {model.__name__}. {created_count} new records created.")
 
-async def run():
+async def run(filepaths, batch_size: int):
     """데이터베이스를 초기화하고 모든 임포트 작업을 실행합니다."""
-    await Tortoise.init(db_url=database_url, modules={"models": MODELS})
-    await Tortoise.generate_schemas()
+    print(f"Database URL: {database_url}")
+    await Tortoise.init(config=tortoise_config(database_url, MODELS))
+    await migrate()
 
-    # 명언 데이터 임포트
-    QUOTES_FILE_PATH = os.path.join(PROJECT_ROOT, 'data', 'quotes.xlsx')
-    
-    # 🌟 [수정된 부분]: 'data/quotes.xlsx' 대신 QUOTES_FILE_PATH 변수를 사용합니다.
-    await import_from_xlsx(Quote, QUOTES_FILE_PATH, {'author': 'author', 'message': 'message'})
-    
+    for filepath in filepaths:
+        await import_quotes(filepath, batch_size)
 
     await Tortoise.close_connections()
 
 if __name__ == "__main__":
-    asyncio.run(run())
+    parser = argparse.ArgumentParser(description="명언 XLSX/CSV 파일을 DB 로 가져오기")
+    parser.add_argument("files", nargs="*", default=[QUOTES_FILE_PATH], help="가져올 .xlsx / .csv 파일들")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.files, args.batch_size))
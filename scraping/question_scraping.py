@@ -1,53 +1,96 @@
-import requests
+import argparse
+import asyncio
+import os
+import sys
+from typing import List
+
+import httpx
 from bs4 import BeautifulSoup
-import sqlite3 
+from tortoise import Tortoise
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import database_url
+from src.model.questions import Question
+from src.tools.bulk_import import bulk_upsert
+from src.tools.database import MODELS, tortoise_config
+from src.tools.migrate import migrate
 
 TARGET_URL = "https://wealthinsight.tistory.com/entry/365%EC%9D%BC-1-%EC%9D%BC-1-%EC%A7%88%EB%AC%B8-%ED%95%98%EB%A3%A8%EB%A5%BC-%EB%A7%88%EB%AC%B4%EB%A6%AC%ED%95%98%EB%A9%B0-%EB%82%98%EC%97%90%EA%B2%8C-%EB%AC%BB%EB%8A%94-%EC%A7%88%EB%AC%B8%EC%9D%98-%ED%9E%98#google_vignette"
 
-try:
-    response = requests.get(TARGET_URL)
-    response.raise_for_status() #
-    html_content = response.text
-except requests.exceptions.RequestException as e:
-    print(f"URL 요청 중 오류 발생: {e}")
-    exit()
 
-soup = BeautifulSoup(html_content, 'html.parser')
+def fetch_html(url: str) -> str:
+    response = httpx.get(url, follow_redirects=True, timeout=20)
+    response.raise_for_status()
+    return response.text
+
 
-data_to_save = []
-tables = soup.find_all('table', {'border': '1'})
+def parse_questions(html_content: str) -> List[str]:
+    """페이지의 'border=1' 테이블들에서 두 번째 칸(질문)을 순서대로 뽑는다. 중복은 처음 것만 남김."""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    questions: List[str] = []
+    tables = soup.find_all('table', {'border': '1'})
+    if not tables:
+        print("해당 테이블을 찾을 수 없습니다.")
+        return questions
 
-if tables:
     print(f"페이지에서 {len(tables)}개의 'border=1' 테이블을 찾았습니다.")
     for i, table in enumerate(tables):
-        print(f"\n--- 테이블 {i+1} 처리 중 ---")
         tbody = table.find('tbody')
-        
-        if tbody:
-            print("<tbody> 내용물을 성공적으로 찾았습니다.")
-            rows = tbody.find_all('tr')
-
-            for row in rows:
-                cells = row.find_all('td')
-                if len(cells) > 1:
-                    question_text = cells[1].get_text(strip=True)
-                    data_to_save.append(question_text)
-        else:
-            print("<tbody> 태그를 찾을 수 없습니다.")
-else:
-    print("해당 테이블을 찾을 수 없습니다.")
-
-print("\n스크래핑된 질문 목록:")
-print(data_to_save)
-
-
-conn = sqlite3.connect('/home/ec2-user/5billion_in_my_bank_account/db.sqlite3')
-cursor = conn.cursor()
- 
-for question in data_to_save:
-    cursor.execute("INSERT INTO question (message) VALUES (?)", (question,))
- 
-conn.commit()
-conn.close()
- 
-print(f"\n데이터베이스에 {len(data_to_save)}개의 질문을 성공적으로 저장했습니다.")
+        if tbody is None:
+            print(f"테이블 {i+1}: <tbody> 태그를 찾을 수 없습니다.")
+            continue
+        for row in tbody.find_all('tr'):
+            cells = row.find_all('td')
+            if len(cells) > 1:
+                question_text = cells[1].get_text(strip=True)
+                if question_text:
+                    questions.append(question_text)
+    return list(dict.fromkeys(questions))
+
+
+async def save_questions(questions: List[str]) -> None:
+    await Tortoise.init(config=tortoise_config(database_url, MODELS))
+    await migrate()
+
+    # message 유니크 인덱스 기준으로 이미 있는 질문은 건너뜀 (여러 번 실행해도 중복 없음)
+    stats = await bulk_upsert(Question, ({"message": question} for question in questions), conflict_fields=("message",))
+    print(f"\n데이터베이스 저장 완료: {stats}")
+
+    await Tortoise.close_connections()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="하루 1질문 목록 스크래핑 후 DB 저장")
+    parser.add_argument("--url", default=TARGET_URL)
+    parser.add_argument("--html-file", help="저장해둔 HTML 파일에서 파싱 (네트워크 사용 안 함)")
+    parser.add_argument("--save-html", help="받아온 HTML 을 이 경로에 저장")
+    parser.add_argument("--dry-run", action="store_true", help="DB 에 저장하지 않고 파싱 결과만 출력")
+    args = parser.parse_args()
+
+    if args.html_file:
+        with open(args.html_file, encoding='utf-8') as html_file:
+            html_content = html_file.read()
+    else:
+        try:
+            html_content = fetch_html(args.url)
+        except httpx.HTTPError as e:
+            print(f"URL 요청 중 오류 발생: {e}")
+            sys.exit(1)
+        if args.save_html:
+            with open(args.save_html, 'w', encoding='utf-8') as html_file:
+                html_file.write(html_content)
+
+    questions = parse_questions(html_content)
+    print(f"\n스크래핑된 질문 {len(questions)}개")
+
+    if args.dry_run:
+        for question in questions:
+            print(question)
+        return
+    asyncio.run(save_questions(questions))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,63 +1,261 @@
-import requests
-from bs4 import BeautifulSoup as bs
-import time
-import random
+import argparse
+import asyncio
 import csv
+import json
+import os
+import random
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Set, Tuple
+
+import httpx
+from bs4 import BeautifulSoup as bs
 
 
-START_NO = 1 
+START_NO = 1
 END_NO = 6118
 
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Safari/537.36'
 }
 BASE_URL = 'https://gall.dcinside.com/mgallery/board/view/?id=quotes&no='
+TARGET_NICKNAME = "Talnos"
+
+CSV_HEADER = ['No.', 'quote', 'author']
+OUTPUT_FILE = 'dc_quotes_data.csv'
+CHECKPOINT_FILE = 'dc_quotes_checkpoint.json'
+MAX_RETRIES = 3
+
+
+def parse_post(html_text: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """
+    게시글 HTML 에서 (상태, 명언, 저자) 를 뽑는다. 프로세스 풀에서 실행되므로 최상위 함수로 둠.
+    상태: "ok" / "missing" (삭제/접근 불가) / "filtered" (다른 작성자, 저자 자리에 그 닉네임)
+    """
+    html = bs(html_text, 'html.parser')
+    content_tag = html.find(class_='write_div')
+    nickname_tag = html.find(class_='nickname')
+    dc_nickname = nickname_tag.get_text(strip=True) if nickname_tag else None
+
+    if content_tag is None:
+        return "missing", None, None
+    if dc_nickname != TARGET_NICKNAME:
+        return "filtered", None, dc_nickname
+
+    content = content_tag.get_text(strip=True, separator='\n')
+    if '-' in content:
+        last_hyphen_index = content.rfind('-')
+        quote_text = content[:last_hyphen_index].strip()
+        author_name = content[last_hyphen_index + 1:].strip()
+    else:
+        quote_text = content
+        author_name = "정보 없음"
+    return "ok", quote_text, author_name
+
+
+class TokenBucket:
+    """초당 rate 개, 최대 burst 개까지 몰아서 요청을 허용하는 토큰 버킷."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
 
-csv_file = open('dc_quotes_data.csv', 'a', newline='', encoding='utf-8-sig')
-writer = csv.writer(csv_file)
 
+class Checkpoint:
+    """
+    끝난 글 번호 중 '여기까지는 빠짐없이 끝남' 인 번호(last_completed)를 파일에 남긴다.
+    동시에 여러 글을 처리하므로 끝나는 순서가 뒤섞여도 연속된 구간만 앞으로 전진한다.
+    실패한 글도 구간은 넘어가되 failed 에 남겨서 다음 실행 때 다시 시도한다.
+    """
 
-writer.writerow(['No.', 'quote', 'author']) 
-print("CSV 파일 'dc_quotes_data.csv' 준비 완료.\n")
+    def __init__(self, path: str, start_no: int):
+        self.path = path
+        self.last_completed = start_no - 1
+        self.failed: Set[int] = set()
+        self._done_ahead: Set[int] = set()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as checkpoint_file:
+                saved = json.load(checkpoint_file)
+            self.last_completed = max(self.last_completed, saved.get("last_completed", 0))
+            self.failed = set(saved.get("failed", []))
 
+    def mark_done(self, post_no: int) -> None:
+        self._done_ahead.add(post_no)
+        while self.last_completed + 1 in self._done_ahead:
+            self.last_completed += 1
+            self._done_ahead.discard(self.last_completed)
 
-for post_no in range(START_NO, END_NO + 1):
-    url = f"{BASE_URL}{post_no}"
-    time.sleep(random.uniform(2, 4)) 
+    def save(self) -> None:
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as checkpoint_file:
+            json.dump({"last_completed": self.last_completed, "failed": sorted(self.failed)}, checkpoint_file)
+        os.replace(temp_path, self.path)
+
+
+def _written_post_numbers(output: str) -> Set[int]:
+    # 체크포인트 이후에 이미 CSV 에 써진 글은 다시 받지 않음 (재시작 시 중복 방지)
+    numbers: Set[int] = set()
+    if not os.path.exists(output):
+        return numbers
+    with open(output, newline='', encoding='utf-8-sig') as csv_file:
+        for row in csv.reader(csv_file):
+            if row and row[0].isdigit():
+                numbers.add(int(row[0]))
+    return numbers
+
+
+async def crawl(
+    start_no: int,
+    end_no: int,
+    base_url: str = BASE_URL,
+    output: str = OUTPUT_FILE,
+    checkpoint_path: str = CHECKPOINT_FILE,
+    concurrency: int = 4,
+    rate: float = 1.0,
+    burst: int = 2,
+    parse_workers: int = 2,
+) -> None:
+    checkpoint = Checkpoint(checkpoint_path, start_no)
+    already_written = _written_post_numbers(output)
+    # 실패한 글도 완료로 처리해서 연속 구간은 넘어가므로, 이전 실행에서 실패한 글은 앞에 다시 넣어서 재시도
+    retry = sorted(
+        no for no in checkpoint.failed
+        if start_no <= no <= min(end_no, checkpoint.last_completed) and no not in already_written
+    )
+    checkpoint.failed.difference_update(already_written)
+    pending = retry + [
+        no for no in range(max(start_no, checkpoint.last_completed + 1), end_no + 1)
+        if no not in already_written
+    ]
+    for no in range(checkpoint.last_completed + 1, end_no + 1):
+        if no in already_written:
+            checkpoint.mark_done(no)
+    print(f"{len(pending)}개 글 수집 시작 (이어받기 지점: {checkpoint.last_completed + 1}번, 재시도 {len(retry)}건)\n")
+
+    is_new_file = not os.path.exists(output) or os.path.getsize(output) == 0
+    csv_file = open(output, 'a', newline='', encoding='utf-8-sig')
+    writer = csv.writer(csv_file)
+    if is_new_file:
+        writer.writerow(CSV_HEADER)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for post_no in pending:
+        queue.put_nowait(post_no)
+
+    bucket = TokenBucket(rate, burst)
+    loop = asyncio.get_running_loop()
+    last_saved = time.monotonic()
+
+    def complete(post_no: int) -> None:
+        nonlocal last_saved
+        checkpoint.mark_done(post_no)
+        if time.monotonic() - last_saved > 5:
+            # CSV 를 먼저 디스크에 내려야 체크포인트가 실제 데이터보다 앞서지 않음
+            csv_file.flush()
+            checkpoint.save()
+            last_saved = time.monotonic()
+
+    async def fetch(client: httpx.AsyncClient, post_no: int) -> Optional[str]:
+        for attempt in range(1, MAX_RETRIES + 1):
+            await bucket.acquire()
+            try:
+                response = await client.get(f"{base_url}{post_no}")
+                if response.status_code < 500:
+                    return response.text
+            except httpx.HTTPError as e:
+                print(f"[Error] {post_no}번 글 요청 실패 ({attempt}/{MAX_RETRIES}): {type(e).__name__}")
+            await asyncio.sleep(random.uniform(1, 2) * attempt)
+        return None
+
+    async def worker(client: httpx.AsyncClient, pool: ProcessPoolExecutor) -> None:
+        while True:
+            post_no = await queue.get()
+            try:
+                html_text = await fetch(client, post_no)
+                if html_text is None:
+                    checkpoint.failed.add(post_no)
+                    print(f"[Error] {post_no}번 글 처리 실패, 건너뜀.")
+                    continue
+                status, quote_text, author_name = await loop.run_in_executor(pool, parse_post, html_text)
+                checkpoint.failed.discard(post_no)
+                if status == "ok":
+                    writer.writerow([post_no, quote_text, author_name])
+                    print(f"[SUCCESS] {post_no}번 글 '{quote_text[:15]}...' 저장 완료.")
+                elif status == "missing":
+                    print(f"[SKIP] {post_no}번 글: 삭제되었거나 접근 불가능.")
+                else:
+                    print(f"[SKIP] {post_no}번 글: 작성자 '{author_name}' 필터링 제외.")
+            except Exception as e:
+                checkpoint.failed.add(post_no)
+                print(f"[Error] {post_no}번 글 처리 중 오류 발생: {type(e).__name__}")
+            finally:
+                complete(post_no)
+                queue.task_done()
+
+    # SIGTERM 으로 종료되어도 아래 finally 에서 CSV/체크포인트를 저장하도록 취소로 바꿔줌
+    main_task = asyncio.current_task()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, main_task.cancel)
+    except (NotImplementedError, RuntimeError):
+        pass
 
     try:
-        response = requests.get(url, headers=HEADERS)
-        html = bs(response.text, 'html.parser')
-
-        content_tag = html.find(class_='write_div')
-        nickname_tag = html.find(class_='nickname') 
-
-        dc_nickname = nickname_tag.get_text(strip=True) if nickname_tag else None
-        
-        if content_tag and dc_nickname == "Talnos":
-            content = content_tag.get_text(strip=True, separator='\n')
-            
-            if '-' in content:
-                last_hyphen_index = content.rfind('-')
-                quote_text = content[:last_hyphen_index].strip()
-                author_name = content[last_hyphen_index + 1:].strip()
-            else:
-                quote_text = content
-                author_name = "정보 없음"
-
-            writer.writerow([post_no, quote_text, author_name])
-            
-            print(f"[SUCCESS] {post_no}번 글 '{quote_text[:15]}...' 저장 완료.")
-        
-        elif content_tag is None:
-            print(f"[SKIP] {post_no}번 글: 삭제되었거나 접근 불가능.")
-        
-        else:
-             print(f"[SKIP] {post_no}번 글: 작성자 '{dc_nickname}' 필터링 제외.")
-
-
-    except Exception as e:
-        print(f"[Error] {post_no}번 글 처리 중 오류 발생: {type(e).__name__}") 
-
-csv_file.close()
-print("\n---완료 ---")
\ No newline at end of file
+        with ProcessPoolExecutor(max_workers=parse_workers) as pool:
+            async with httpx.AsyncClient(headers=HEADERS, timeout=20, follow_redirects=True) as client:
+                workers = [asyncio.create_task(worker(client, pool)) for _ in range(concurrency)]
+                all_done = asyncio.create_task(queue.join())
+                # 워커가 예외로 죽으면 queue.join() 이 영원히 안 끝나므로 같이 기다림
+                done, _ = await asyncio.wait([all_done, *workers], return_when=asyncio.FIRST_COMPLETED)
+                all_done.cancel()
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+                for task in done:
+                    if task is not all_done and not task.cancelled() and task.exception():
+                        raise task.exception()
+    finally:
+        csv_file.flush()
+        csv_file.close()
+        checkpoint.save()
+
+    print(f"\n---완료 --- (마지막 연속 완료: {checkpoint.last_completed}번, 실패 {len(checkpoint.failed)}건)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="디시 명언 갤러리 수집기 (동시 요청, 속도 제한, 이어받기)")
+    parser.add_argument("--start", type=int, default=START_NO)
+    parser.add_argument("--end", type=int, default=END_NO)
+    parser.add_argument("--base-url", default=BASE_URL, help="글 번호 앞까지의 주소 (로컬 테스트 서버 주소로 바꿀 수 있음)")
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE)
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 처리할 글 수")
+    parser.add_argument("--rate", type=float, default=1.0, help="초당 요청 수")
+    parser.add_argument("--burst", type=int, default=2, help="한 번에 몰아서 보낼 수 있는 최대 요청 수")
+    parser.add_argument("--parse-workers", type=int, default=2, help="HTML 파싱 프로세스 수")
+    args = parser.parse_args()
+    asyncio.run(crawl(
+        args.start,
+        args.end,
+        base_url=args.base_url,
+        output=args.output,
+        checkpoint_path=args.checkpoint,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        burst=args.burst,
+        parse_workers=args.parse_workers,
+    ))
@@ -1,7 +1,34 @@
-from tortoise import fields, models
+from tortoise import fields, models, timezone
+from tortoise.indexes import Index
+
+from src.model.indexes import UniqueIndex
 
 class Bookmark(models.Model):
 	id = fields.IntField(pk=True)
 	user = fields.ForeignKeyField("models.User", related_name="bookmarks", on_delete=fields.RESTRICT)
 	quote = fields.ForeignKeyField("models.Quote", related_name="bookmarks", on_delete=fields.CASCADE) 
-	created_at = fields.DatetimeField(auto_now_add=True)
\ No newline at end of file
+	created_at = fields.DatetimeField(auto_now_add=True)
+
+	class Meta:
+		indexes = (
+			# 기존 DB 에서는 마이그레이션 1 이 중복 북마크를 정리한 뒤 만듦
+			UniqueIndex(fields=("user_id", "quote_id"), name="uidx_bookmark_user_quote"),
+			# 북마크 목록은 user 로 거르고 created_at 최신순으로 키셋 페이지네이션함
+			Index(fields=("user_id", "created_at"), name="idx_bookmark_user_created"),
+		)
+
+	# 북마크 추가/삭제는 조회 없이 SQL 한 문장으로 처리 (유니크 인덱스와 외래키가 검사를 대신함)
+	@classmethod
+	async def add(cls, user_id: int, quote_id: int) -> bool:
+		"""새로 추가되면 True, 이미 있으면 False. 없는 명언이면 IntegrityError (외래키 위반)."""
+		created_at = cls._meta.fields_map["created_at"].to_db_value(timezone.now(), cls)
+		inserted, _ = await cls._meta.db.execute_query(
+			'INSERT INTO "bookmark" ("user_id", "quote_id", "created_at") VALUES (?, ?, ?) '
+			'ON CONFLICT ("user_id", "quote_id") DO NOTHING',
+			[user_id, quote_id, created_at],
+		)
+		return inserted > 0
+
+	@classmethod
+	async def remove(cls, user_id: int, quote_id: int) -> bool:
+		return await cls.filter(user_id=user_id, quote_id=quote_id).delete() > 0
@@ -0,0 +1,10 @@
+from tortoise import fields
+from tortoise.models import Model
+
+# 내용 해시로 저장된 이미지 파일 (같은 파일은 한 번만 저장하고 참조 수로 관리)
+class ImageBlob(Model):
+    hash = fields.CharField(max_length=64, pk=True) # sha256 hex
+    extension = fields.CharField(max_length=8)
+    size = fields.IntField()
+    ref_count = fields.IntField(default=0)
+    created_at = fields.DatetimeField(auto_now_add=True)
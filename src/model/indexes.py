@@ -0,0 +1,6 @@
+from tortoise.indexes import Index
+
+
+class UniqueIndex(Index):
+    # generate_schemas 와 마이그레이션이 같은 이름의 UNIQUE INDEX 를 만들도록 명시적으로 선언할 때 사용
+    INDEX_TYPE = "UNIQUE"
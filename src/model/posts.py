@@ -1,4 +1,5 @@
 from tortoise import fields
+from tortoise.indexes import Index
 from tortoise.models import Model
 
 from src.model.users import User
@@ -16,5 +17,9 @@ class Post(Model):
     created_at = fields.DatetimeField(auto_now_add=True)
     author: User = fields.ForeignKeyField("models.User", related_name="posts")
 
+    class Meta:
+        # 모든 게시글 조회가 author 로 거르고 date 로 정렬/범위 검색함
+        indexes = (Index(fields=("author_id", "date"), name="idx_post_author_date"),)
+
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
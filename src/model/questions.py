@@ -1,6 +1,13 @@
 from tortoise import fields
 from tortoise.models import Model
 
+from src.model.indexes import UniqueIndex
+
 class Question(Model):
     id = fields.IntField(pk=True)
-    message = fields.TextField()
\ No newline at end of file
+    message = fields.TextField()
+
+    class Meta:
+        # 스크래퍼를 다시 돌려도 같은 질문이 중복으로 쌓이지 않도록 함
+        # 기존 DB 에서는 마이그레이션 3 이 중복 질문을 정리한 뒤 만듦
+        indexes = (UniqueIndex(fields=("message",), name="uidx_question_message"),)
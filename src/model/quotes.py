@@ -1,4 +1,5 @@
 from tortoise import fields
+from tortoise.indexes import Index
 from tortoise.models import Model
 import typing
 
@@ -9,4 +10,13 @@ class Quote(Model):
     id = fields.IntField(pk=True)
     author = fields.CharField(max_length=100)
     message = fields.TextField()
-    bookmarks: fields.ReverseRelation["Bookmark"]
\ No newline at end of file
+    bookmarks: fields.ReverseRelation["Bookmark"]
+
+    class Meta:
+        # 저자별 목록을 id 순으로 키셋 페이지네이션함
+        indexes = (Index(fields=("author", "id"), name="idx_quote_author_id"),)
+
+# 저자별 명언 수 (검색 화면의 저자 필터용). quote 테이블 트리거가 갱신함 (src/tools/quote_search.py)
+class QuoteAuthor(Model):
+    author = fields.CharField(max_length=100, pk=True)
+    quote_count = fields.IntField(default=0)
@@ -9,4 +9,12 @@ from src.model.posts import Post
 class PostUpdate(BaseModel):
     title: str
     content: str
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PostSearchHit(BaseModel):
+    id: int
+    title: str
+    date: datetime.date
+    title_highlight: str # 검색어가 <mark> 로 감싸진 제목 (HTML escape 됨)
+    snippet: str # 검색어 주변 본문 일부 (HTML escape 됨)
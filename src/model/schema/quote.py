@@ -1,6 +1,27 @@
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 class QuoteResponse(BaseModel):
     id: int
     author: str
     message: str
+
+
+class BookmarkPage(BaseModel):
+    items: List[QuoteResponse]
+    next_cursor: Optional[str] = None
+
+
+class BookmarkStatus(BaseModel):
+    bookmarked: List[int]
+
+
+class QuotePage(BaseModel):
+    items: List[QuoteResponse]
+    next_cursor: Optional[str] = None
+
+
+class AuthorCount(BaseModel):
+    author: str
+    quote_count: int
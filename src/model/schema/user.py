@@ -1,7 +1,7 @@
 from pydantic import BaseModel
 from pydantic import Field
 from datetime import date
-from typing import List
+from typing import List, Optional
 
 class UserCreate(BaseModel):
     username: str
@@ -12,6 +12,9 @@ class UserResponse(BaseModel):
     id: int
     username: str
     number_of_posts: int
+    days_written: int = 0
+    current_streak: int = 0
+    longest_streak: int = 0
 
 class UserUpdatePassword(BaseModel):
     old_password: str
@@ -26,4 +29,19 @@ class UserDelete(BaseModel):
 
 class CalendarEntry(BaseModel):
     date: date
-    post_ids: List[int]
\ No newline at end of file
+    post_ids: List[int]
+
+class MonthStats(BaseModel):
+    month: str
+    post_count: int
+    days_written: int
+
+
+class UserStatsResponse(BaseModel):
+    total_posts: int
+    days_written: int
+    current_streak: int
+    longest_streak: int
+    last_post_date: Optional[date] = None
+    writing_rate: float = Field(description="Percentage of days since sign-up with at least one post")
+    months: List[MonthStats]
@@ -0,0 +1,38 @@
+from tortoise import fields
+from tortoise.models import Model
+
+from src.model.indexes import UniqueIndex
+
+# 유저별 작성 통계. 게시글 작성/수정/삭제 때 같은 트랜잭션에서 갱신되고 (src/tools/user_stats.py),
+# /me 와 통계 API 는 여기서 바로 읽는다.
+class UserStats(Model):
+    id = fields.IntField(pk=True)
+    user = fields.OneToOneField("models.User", related_name="stats", on_delete=fields.CASCADE)
+    total_posts = fields.IntField(default=0)
+    days_written = fields.IntField(default=0) # 글을 쓴 서로 다른 날짜 수
+    current_streak = fields.IntField(default=0) # last_post_date 에서 끝나는 연속 작성 일수
+    longest_streak = fields.IntField(default=0)
+    last_post_date = fields.DateField(null=True)
+    updated_at = fields.DatetimeField(auto_now=True)
+
+
+# 날짜별 게시글 수 (0 이 되면 row 삭제). 작성일 집합이 바뀌었는지와 연속 작성 재계산에 사용
+class UserDayCount(Model):
+    id = fields.IntField(pk=True)
+    user = fields.ForeignKeyField("models.User", related_name="day_counts", on_delete=fields.CASCADE)
+    date = fields.DateField()
+    post_count = fields.IntField(default=0)
+
+    class Meta:
+        indexes = (UniqueIndex(fields=("user_id", "date"), name="uidx_userdaycount_user_date"),)
+
+
+class UserMonthCount(Model):
+    id = fields.IntField(pk=True)
+    user = fields.ForeignKeyField("models.User", related_name="month_counts", on_delete=fields.CASCADE)
+    month = fields.CharField(max_length=7) # YYYY-MM
+    post_count = fields.IntField(default=0)
+    days_written = fields.IntField(default=0)
+
+    class Meta:
+        indexes = (UniqueIndex(fields=("user_id", "month"), name="uidx_usermonthcount_user_month"),)
@@ -1,17 +1,26 @@
 from hashlib import sha256
 
-from passlib.context import CryptContext
 from tortoise import fields
 from tortoise.models import Model
 import typing
 
 from config import password_salt
+from src.tools.hashing import hash_pool
 
 if typing.TYPE_CHECKING:
+    from passlib.context import CryptContext
     from src.model.posts import Post
     from src.model.bookmarks import Bookmark
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+_pwd_context: typing.Optional["CryptContext"] = None
+
+def pwd_context() -> "CryptContext":
+    # passlib 은 import 만 수십 ms 걸려서 서버 시작 때가 아니라 처음 해시할 때 불러옴
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+    return _pwd_context
 
 class User(Model):
     
@@ -21,7 +30,7 @@ class User(Model):
     login_id = fields.CharField(max_length=50, unique=True)
     hash_password = fields.CharField(max_length=255)
 
-    number_of_posts = fields.IntField(default=0)
+    number_of_posts = fields.IntField(default=0) # 게시글 작성/삭제 때 src/tools/user_stats.py 에서 갱신
     posts = fields.ReverseRelation["Post"]
 
     bookmarks: fields.ReverseRelation["Bookmark"]
@@ -29,18 +38,19 @@ class User(Model):
     def __str__(self) -> str:
         return self.username
 
-    def _get_percentage_of_posts(self) -> float:
-        expected_posts = self.created_at.date().toordinal()
-        if expected_posts == 0:
-            return 0.0
-        return (self.number_of_posts / expected_posts) * 100
-    
     def _salt_password(self, password: str) -> str:
         salted = f"{password}{password_salt}".encode("utf-8")
         return sha256(salted).hexdigest()
 
     def set_password(self, password: str) -> None:
-        self.hash_password = pwd_context.hash(self._salt_password(password))
+        self.hash_password = pwd_context().hash(self._salt_password(password))
 
     def verify_password(self, password: str) -> bool:
-        return pwd_context.verify(self._salt_password(password), self.hash_password)
\ No newline at end of file
+        return pwd_context().verify(self._salt_password(password), self.hash_password)
+
+    # 로그인/회원가입 핸들러용: 해시 계산을 이벤트 루프 밖 전용 스레드 풀에서 실행
+    async def set_password_async(self, password: str) -> None:
+        self.hash_password = await hash_pool.run(pwd_context().hash, self._salt_password(password))
+
+    async def verify_password_async(self, password: str) -> bool:
+        return await hash_pool.run(pwd_context().verify, self._salt_password(password), self.hash_password)
@@ -0,0 +1,53 @@
+import asyncio
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from pydantic import BaseModel
+
+from src.model.schema.question import QuestionResponse
+from src.model.schema.quote import QuoteResponse
+from src.model.schema.user import CalendarEntry, UserResponse
+from src.model.users import User
+from src.router.posts import PostOut, posts_of_week
+from src.router.users import calendar_entries, month_range, user_response
+from src.tools.id_pool import question_pool, quote_pool
+from src.tools.jwt import get_current_user
+
+router = APIRouter(
+    prefix="/api/v1/home",
+    tags=["home"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+class BootstrapResponse(BaseModel):
+    user: UserResponse
+    calendar: List[CalendarEntry]
+    week_posts: List[PostOut]
+    quote: Optional[QuoteResponse] = None
+    question: Optional[QuestionResponse] = None
+
+
+@router.get("/bootstrap", response_model=BootstrapResponse)
+async def get_bootstrap(
+    target_date: Optional[date] = Query(None, description="Date shown on the page (default: today)"),
+    user: User = Depends(get_current_user),
+):
+    # 로그인 후 첫 화면에 필요한 데이터를 한 번의 요청으로: 인증은 한 번, 서로 독립인 조회는 동시에 실행
+    target_date = target_date or date.today()
+    month_start, month_end = month_range(f"{target_date:%Y-%m}")
+    me, calendar, week_posts, quote, question = await asyncio.gather(
+        user_response(user),
+        calendar_entries(user, month_start, month_end),
+        posts_of_week(user, target_date),
+        quote_pool.pick(),
+        question_pool.pick(),
+    )
+    return BootstrapResponse(
+        user=me,
+        calendar=calendar,
+        week_posts=week_posts,
+        quote=QuoteResponse.model_validate(quote, from_attributes=True) if quote else None,
+        question=QuestionResponse.model_validate(question, from_attributes=True) if question else None,
+    )
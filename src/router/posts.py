@@ -1,7 +1,8 @@
 import json
+from contextlib import nullcontext
 from datetime import date, timedelta
 from pathlib import Path
-from typing import List, Optional, Tuple, Type, TypeVar
+from typing import List, Literal, Optional, Tuple, Type, TypeVar
 
 from fastapi import (
     APIRouter,
@@ -18,17 +19,28 @@ from fastapi.responses import FileResponse
 from pydantic import BaseModel
 from tortoise.contrib.pydantic import pydantic_model_creator
 from tortoise.exceptions import DoesNotExist
+from tortoise.expressions import Q
+from tortoise.transactions import in_transaction
 
 from src.model.posts import Post
-from src.model.schema.post import PostUpdate
+from src.model.schema.post import PostSearchHit, PostUpdate
 from src.model.users import User
-from src.tools.image import _process_image
+from src.tools import user_stats
+from src.tools.cursor import decode_cursor, encode_cursor
+from src.tools.database import WRITE_CONNECTION
+from src.tools.fts import match_query, render_marks
+from src.tools.image import StagedImage, acquire_image, release_image, remove_image_file
 from src.tools.jwt import get_current_user
+from src.tools.post_search import index_post, search_posts, unindex_post
+from src.tools.responses import FastJSONResponse
+from src.tools.thumbnail import best_variant, schedule_derivatives
+
+POST_OUT_FIELDS = ("id", "title", "date", "content", "image_url", "created_at")
 
 PostOut = pydantic_model_creator(
     Post,
     name="PostOut",
-    include=("id", "title", "date", "content", "image_url", "created_at"),
+    include=POST_OUT_FIELDS,
 )
 
 router = APIRouter(
@@ -42,6 +54,11 @@ class ImageUploadResponse(BaseModel):
     image_url: str
 
 
+class PostPage(BaseModel):
+    items: List[PostOut]
+    next_cursor: Optional[str] = None
+
+
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=PostOut)
 async def create_post(
     title: str = Form(...),
@@ -50,12 +67,16 @@ async def create_post(
     user: User = Depends(get_current_user),
 ):
     try:
-        post = await Post.create(
-            author=user,
-            title=title,
-            content=content,
-            date=date,
-        )
+        async with in_transaction(WRITE_CONNECTION) as conn:
+            post = await Post.create(
+                author=user,
+                title=title,
+                content=content,
+                date=date,
+                using_db=conn,
+            )
+            await user_stats.post_added(conn, user.id, post.date)
+            await index_post(conn, post)
         return await PostOut.from_tortoise_orm(post)
     except Exception as exc:
         raise HTTPException(
@@ -79,13 +100,24 @@ async def image_upload(
     except DoesNotExist:
         raise HTTPException(status_code=404, detail="Post not found or access denied.")
 
-    image_path = await _process_image(image_file, user.id)
-    target_post.image_url = image_path
-    await target_post.save()
-    return ImageUploadResponse(image_url=image_path)
-
-
-@router.get("/", response_model=List[PostOut])
+    # 참조 수 변경은 게시글 저장과 같은 트랜잭션에서 하고, 파일 삭제는 커밋한 뒤에 함
+    async with StagedImage(image_file) as image:
+        async with in_transaction(WRITE_CONNECTION) as conn:
+            # 먼저 읽어둔 행은 그 사이 다른 업로드가 바꿨을 수 있으니 트랜잭션 안에서 다시 읽은 이미지를 놓아줌
+            target_post = await Post.get_or_none(id=post_id, author=user).using_db(conn)
+            if target_post is None:
+                raise HTTPException(status_code=404, detail="Post not found or access denied.")
+            await acquire_image(conn, image)
+            previous_image = target_post.image_url
+            target_post.image_url = image.url
+            await target_post.save(using_db=conn)
+            released = await release_image(conn, previous_image)
+    await remove_image_file(released)
+    schedule_derivatives(image.url)
+    return ImageUploadResponse(image_url=image.url)
+
+
+@router.get("/", response_model=List[PostOut], response_class=FastJSONResponse)
 async def get_my_posts(
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
@@ -95,16 +127,53 @@ async def get_my_posts(
         Post.filter(author=user)
         .offset((page - 1) * limit)
         .limit(limit)
-        .order_by("date")
+        .order_by("date", "id")
     )
-    return await PostOut.from_queryset(posts_query)
+    # 목록은 ORM 객체/pydantic 모델을 거치지 않고 dict 로 받아 바로 orjson 인코딩 (스키마는 PostOut 과 같음)
+    return FastJSONResponse(await posts_query.values(*POST_OUT_FIELDS))
+
+
+@router.get("/cursor", response_model=PostPage)
+async def get_my_posts_by_cursor(
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(10, ge=1, le=100, description="Items per page"),
+    user: User = Depends(get_current_user),
+):
+    # (date, id) 기준 키셋 페이지네이션: OFFSET 없이 마지막 위치 다음부터 바로 읽음
+    posts_query = Post.filter(author=user)
+    if cursor:
+        raw_date, last_id = decode_cursor(cursor, 2)
+        try:
+            last_date = date.fromisoformat(raw_date)
+            last_id = int(last_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        # (date, id) > (last_date, last_id)
+        posts_query = posts_query.filter(date__gte=last_date).filter(
+            Q(date__gt=last_date) | Q(id__gt=last_id)
+        )
 
+    posts = await posts_query.order_by("date", "id").limit(limit + 1)
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode_cursor(posts[-1].date, posts[-1].id)
 
-@router.get("/by-week", response_model=List[PostOut])
+    return PostPage(
+        items=[await PostOut.from_tortoise_orm(post) for post in posts],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/by-week", response_model=List[PostOut], response_class=FastJSONResponse)
 async def get_posts_by_week(
     target_date: date = Query(..., description="Date to inspect"),
     user: User = Depends(get_current_user),
 ):
+    return FastJSONResponse(await posts_of_week(user, target_date))
+
+
+async def posts_of_week(user: User, target_date: date) -> List[dict]:
     start_of_week = target_date - timedelta(days=target_date.weekday())
     end_of_week = start_of_week + timedelta(days=6)
 
@@ -113,12 +182,40 @@ async def get_posts_by_week(
         .filter(date__gte=start_of_week, date__lte=end_of_week)
         .order_by("date")
     )
-    return await PostOut.from_queryset(posts_query)
+    return await posts_query.values(*POST_OUT_FIELDS)
+
+
+@router.get("/search", response_model=List[PostSearchHit])
+async def search_my_posts(
+    q: str = Query(..., min_length=1, max_length=200, description="Search words (all must match, prefix match)"),
+    page: int = Query(1, ge=1, description="Page number"),
+    limit: int = Query(10, ge=1, le=50, description="Items per page"),
+    user: User = Depends(get_current_user),
+):
+    # FTS5 색인에서 내 글만 bm25 점수순으로 찾음 (본문 전체를 LIKE 로 훑지 않음)
+    match = match_query(q)
+    if match is None:
+        raise HTTPException(status_code=400, detail="Search query is empty")
+
+    rows = await search_posts(user.id, match, limit, (page - 1) * limit)
+    return [
+        PostSearchHit(
+            id=row["id"],
+            title=row["title"],
+            date=row["date"],
+            title_highlight=render_marks(row["title_highlight"]),
+            snippet=render_marks(row["snippet"]),
+        )
+        for row in rows
+    ]
 
 
 @router.get("/image/{post_id}")
 async def get_post_image(
     post_id: int,
+    size: Optional[Literal["sm", "md", "full"]] = Query(
+        None, description="Resized WebP variant; falls back to the original while it is being generated"
+    ),
     user: User = Depends(get_current_user),
 ):
     try:
@@ -132,7 +229,7 @@ async def get_post_image(
     if not image_path.exists():
         raise HTTPException(status_code=404, detail="Image not found")
 
-    return FileResponse(image_path)
+    return FileResponse(best_variant(image_path, size))
 
 
 @router.get("/{post_id}", response_model=PostOut)
@@ -218,18 +315,25 @@ async def update_post(
     post_data, image_file = await _parse_payload(request, PostUpdate)
     update_data = post_data.dict(exclude_unset=True)
 
-    if image_file is not None:
-        new_image_path = await _process_image(image_file, user.id)
-        if post.image_url:
-            try:
-                existing_path = Path(post.image_url)
-                if existing_path.exists():
-                    existing_path.unlink()
-            except Exception:
-                pass
-        update_data["image_url"] = new_image_path
-
-    await post.update_from_dict(update_data).save()
+    released = None
+    async with StagedImage(image_file) if image_file is not None else nullcontext() as image:
+        async with in_transaction(WRITE_CONNECTION) as conn:
+            # 놓아줄 이전 이미지와 통계에서 옮길 이전 날짜는 다른 요청이 바꿨을 수 있으니 트랜잭션 안에서 다시 읽은 행 기준
+            post = await Post.get_or_none(id=post_id, author_id=user.id).using_db(conn)
+            if post is None:
+                raise HTTPException(status_code=404, detail="Post not found or access denied.")
+            previous_image = post.image_url
+            previous_date = post.date
+            if image is not None:
+                await acquire_image(conn, image)
+                update_data["image_url"] = image.url
+                released = await release_image(conn, previous_image)
+            await post.update_from_dict(update_data).save(using_db=conn)
+            await user_stats.post_moved(conn, user.id, previous_date, post.date)
+            await index_post(conn, post)
+    if image is not None:
+        await remove_image_file(released)
+        schedule_derivatives(image.url)
     return await PostOut.from_tortoise_orm(post)
 
 
@@ -238,8 +342,18 @@ async def delete_post(
     post_id: int,
     user: User = Depends(get_current_user),
 ):
-    deleted_count = await Post.filter(id=post_id, author_id=user.id).delete()
+    released = []
+    async with in_transaction(WRITE_CONNECTION) as conn:
+        rows = await Post.filter(id=post_id, author_id=user.id).using_db(conn).values_list("image_url", "date")
+        deleted_count = await Post.filter(id=post_id, author_id=user.id).using_db(conn).delete()
+        if deleted_count:
+            for image_url, post_date in rows:
+                await user_stats.post_removed(conn, user.id, post_date)
+                released.append(await release_image(conn, image_url))
+            await unindex_post(conn, post_id)
 
     if deleted_count == 0:
         raise HTTPException(status_code=404, detail="Post not found or access denied.")
+    for path in released:
+        await remove_image_file(path)
     return
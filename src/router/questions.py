@@ -1,8 +1,7 @@
 from fastapi import APIRouter
-import random
 
-from src.model.questions import Question
 from src.model.schema.question import QuestionResponse
+from src.tools.id_pool import question_pool
 
 router = APIRouter(
     prefix="/api/v1/questions",
@@ -12,11 +11,4 @@ router = APIRouter(
 
 @router.get("/", response_model=QuestionResponse)
 async def get_random_question():
-    total = await Question.all().count()
-    if total == 0:
-        return None
-
-    idx = random.randrange(total)
-
-    result = await Question.all().offset(idx).limit(1)
-    return result[0]
\ No newline at end of file
+    return await question_pool.pick()
@@ -1,12 +1,21 @@
-from fastapi import APIRouter, HTTPException, Depends
-from tortoise.exceptions import DoesNotExist
-from typing import List
-import random
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends, Query
+from tortoise.exceptions import IntegrityError
+from tortoise.expressions import Q
+from typing import List, Optional
 
-from src.model.quotes import Quote
 from src.model.bookmarks import Bookmark
-from src.model.schema.quote import QuoteResponse
+from src.model.quotes import Quote, QuoteAuthor
+from src.model.schema.quote import AuthorCount, BookmarkPage, BookmarkStatus, QuotePage, QuoteResponse
+from src.tools.cursor import decode_cursor, encode_cursor
+from src.tools.fts import match_query
+from src.tools.id_pool import quote_pool
 from src.tools.jwt import get_current_user
+from src.tools.quote_search import search_quotes
+
+# 북마크 목록은 Quote 객체를 만들지 않고 JOIN 한 번으로 필요한 컬럼만 가져옴
+BOOKMARK_COLUMNS = ("id", "created_at", "quote__id", "quote__author", "quote__message")
+MAX_STATUS_IDS = 100
 
 router = APIRouter(
     prefix="/api/v1/quotes",
@@ -17,48 +26,130 @@ router = APIRouter(
 @router.get("/", response_model=QuoteResponse)
 async def get_random_quote():
     # 랜덤 명언 반환 api 구현
-    total = await Quote.all().count()
-    if total == 0:
-        return None
+    return await quote_pool.pick()
+
+@router.get("/search", response_model=QuotePage)
+async def search_quote_catalogue(
+    q: Optional[str] = Query(None, max_length=200, description="Search words in message/author (prefix match)"),
+    author: Optional[str] = Query(None, max_length=100, description="Only quotes by this author"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(20, ge=1, le=100, description="Items per page"),
+):
+    # q 가 있으면 FTS 색인에서 관련도순, 없으면 id 순으로 전체(또는 저자별) 목록을 키셋 페이지네이션
+    if q is not None and q.strip():
+        match = match_query(q)
+        if match is None:
+            raise HTTPException(status_code=400, detail="Search query is empty")
+        after = None
+        if cursor:
+            last_score, last_id = decode_cursor(cursor, 2)
+            try:
+                after = (float(last_score), int(last_id))
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+        rows = await search_quotes(match, author, after, limit + 1)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["score"], rows[-1]["id"])
+        items = [{"id": row["id"], "author": row["author"], "message": row["message"]} for row in rows]
+        return {"items": items, "next_cursor": next_cursor}
 
-    idx = random.randrange(total)
+    quotes_query = Quote.all() if author is None else Quote.filter(author=author)
+    if cursor:
+        (last_id,) = decode_cursor(cursor, 1)
+        try:
+            quotes_query = quotes_query.filter(id__gt=int(last_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    rows = await quotes_query.order_by("id").limit(limit + 1).values_list("id", "author", "message")
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][0])
+    items = [{"id": quote_id, "author": name, "message": message} for quote_id, name, message in rows]
+    return {"items": items, "next_cursor": next_cursor}
 
-    result = await Quote.all().offset(idx).limit(1)
-    return result[0]
+@router.get("/authors", response_model=List[AuthorCount])
+async def get_quote_authors(
+    prefix: Optional[str] = Query(None, max_length=100, description="Only authors starting with this"),
+    limit: int = Query(50, ge=1, le=500, description="Number of authors"),
+):
+    # 저자 필터용 목록. 명언 수는 트리거가 미리 세어둔 값
+    authors_query = QuoteAuthor.all() if not prefix else QuoteAuthor.filter(author__startswith=prefix)
+    rows = await authors_query.order_by("-quote_count", "author").limit(limit).values_list("author", "quote_count")
+    return [{"author": name, "quote_count": count} for name, count in rows]
 
 @router.post("/bookmark/{quote_id}", status_code=201)
 async def bookmark_quote(quote_id: int, user=Depends(get_current_user)):
     # 명언 북마크 추가 api 구현
     try:
-        quote = await Quote.get(id=quote_id)
-    except DoesNotExist:
+        created = await Bookmark.add(user.id, quote_id)
+    except IntegrityError:
         raise HTTPException(status_code=404, detail="Quote not found")
 
-    bookmark, created = await Bookmark.get_or_create(user=user, quote=quote)
-
     if not created:
         raise HTTPException(status_code=400, detail="Quote already bookmarked")
 
     return {"status": "success", "message": "Quote bookmarked successfully"}
 
+def _bookmark_rows(user):
+    return Bookmark.filter(user=user).order_by("-created_at", "-id")
+
+
+def _quote_from_row(row) -> dict:
+    _, _, quote_id, author, message = row
+    return {"id": quote_id, "author": author, "message": message}
+
 @router.get("/bookmarks/", response_model=List[QuoteResponse]) 
 async def get_bookmarked_quotes(user=Depends(get_current_user)):
-    # 북마크 리스트 조회
-    await user.fetch_related("bookmarks", "bookmarks__quote")
-    bookmarked_quotes = [bookmark.quote for bookmark in user.bookmarks]
-    return bookmarked_quotes
+    # 북마크 리스트 조회 (최근에 북마크한 순)
+    rows = await _bookmark_rows(user).values_list(*BOOKMARK_COLUMNS)
+    return [_quote_from_row(row) for row in rows]
 
-@router.delete("/bookmark/{quote_id}", status_code=204) 
-async def delete_bookmark(quote_id: int, user=Depends(get_current_user)):
-    # 북마크 삭제
-    try:
-        quote = await Quote.get(id=quote_id)
-    except DoesNotExist:
-        raise HTTPException(status_code=404, detail="Quote not found")
+@router.get("/bookmarks/cursor", response_model=BookmarkPage)
+async def get_bookmarked_quotes_by_cursor(
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    user=Depends(get_current_user),
+):
+    # (created_at, id) 내림차순 키셋 페이지네이션
+    bookmarks_query = _bookmark_rows(user)
+    if cursor:
+        raw_created_at, last_id = decode_cursor(cursor, 2)
+        try:
+            last_created_at = datetime.fromisoformat(raw_created_at)
+            last_id = int(last_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        # (created_at, id) < (last_created_at, last_id)
+        bookmarks_query = bookmarks_query.filter(created_at__lte=last_created_at).filter(
+            Q(created_at__lt=last_created_at) | Q(id__lt=last_id)
+        )
+
+    rows = await bookmarks_query.limit(limit + 1).values_list(*BOOKMARK_COLUMNS)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][1].isoformat(), rows[-1][0])
 
-    deleted_count = await Bookmark.filter(user=user, quote=quote).delete()
+    return {"items": [_quote_from_row(row) for row in rows], "next_cursor": next_cursor}
 
-    if deleted_count == 0:
+@router.get("/bookmarks/status", response_model=BookmarkStatus)
+async def get_bookmark_status(
+    ids: List[int] = Query(..., description="Quote ids to check (repeat the parameter)"),
+    user=Depends(get_current_user),
+):
+    # 화면에 보이는 명언들 중 북마크된 것만 한 번에 확인
+    if len(ids) > MAX_STATUS_IDS:
+        raise HTTPException(status_code=400, detail=f"Too many ids (max {MAX_STATUS_IDS})")
+    bookmarked = await Bookmark.filter(user=user, quote_id__in=set(ids)).values_list("quote_id", flat=True)
+    return {"bookmarked": sorted(bookmarked)}
+
+@router.delete("/bookmark/{quote_id}", status_code=204) 
+async def delete_bookmark(quote_id: int, user=Depends(get_current_user)):
+    # 북마크 삭제 (없는 명언이면 북마크도 있을 수 없으므로 같은 404)
+    if not await Bookmark.remove(user.id, quote_id):
         raise HTTPException(status_code=404, detail="Bookmark not found")
     
     return
\ No newline at end of file
@@ -1,7 +1,11 @@
+from email.utils import parsedate_to_datetime
 from pathlib import Path
+from typing import Optional
 
-from fastapi import APIRouter
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Request
+from fastapi.responses import FileResponse, Response
+
+from src.tools.static_manifest import FileVariant, StaticEntry, StaticManifest
 
 STATIC_ROOT = Path(__file__).resolve().parent.parent / "static"
 STATIC_HTML_DIR = STATIC_ROOT / "html"
@@ -10,35 +14,79 @@ STATIC_RESPONSE_DIR = STATIC_ROOT / "response"
 INDEX_FILE = STATIC_HTML_DIR / "index.html"
 NOT_FOUND_FILE = STATIC_RESPONSE_DIR / "404.html"
 
+# 시작할 때 lifespan 에서 build() - 요청 처리 중에는 dict 조회만 함
+manifest = StaticManifest(STATIC_HTML_DIR, STATIC_DIR, NOT_FOUND_FILE)
+
 router = APIRouter(tags=["static"], include_in_schema=False)
 
+
+def _accepts(request: Request, encoding: str) -> bool:
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() == encoding:
+            return params.replace(" ", "") != "q=0"
+    return False
+
+
+def _not_modified(request: Request, variant: FileVariant) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in candidates or variant.etag in candidates
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(variant.stat_result.st_mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _cached_file_response(request: Request, entry: StaticEntry, status_code: int = 200) -> Response:
+    """ETag/Last-Modified 조건부 요청(304)과 미리 압축된 .br/.gz 파일을 처리하는 FileResponse."""
+    variant, encoding = entry.original, None
+    for candidate_encoding, compressed in entry.encoded.items():
+        if _accepts(request, candidate_encoding):
+            variant, encoding = compressed, candidate_encoding
+            break
+
+    headers = {
+        "etag": variant.etag,
+        "last-modified": variant.last_modified,
+        "cache-control": entry.cache_control,
+        "vary": "Accept-Encoding",
+    }
+    if status_code == 200 and _not_modified(request, variant):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["content-encoding"] = encoding
+    return FileResponse(
+        variant.path,
+        status_code=status_code,
+        media_type=entry.media_type,
+        headers=headers,
+        stat_result=variant.stat_result,
+    )
+
+
+def _serve(request: Request, entry: Optional[StaticEntry]) -> Response:
+    if entry is None:
+        return _cached_file_response(request, manifest.not_found, status_code=404)
+    return _cached_file_response(request, entry)
+
+
 @router.get("/")
-async def serve_index():
-    return FileResponse(INDEX_FILE)
+async def serve_index(request: Request):
+    return _serve(request, manifest.page(""))
 
 @router.get("/ast/{asset_path:path}")
-async def serve_asset(asset_path: str):
-    asset_file = STATIC_DIR / asset_path
-    if not asset_file.exists():
-        return {"detail": "Asset not found"}, 404
-    return FileResponse(asset_file)
+async def serve_asset(asset_path: str, request: Request):
+    return _serve(request, manifest.asset(asset_path))
 
 @router.get("/{full_path:path}")
-async def serve_static(full_path: str):
+async def serve_static(full_path: str, request: Request):
 
     if full_path.startswith("src/"):
-        return FileResponse(NOT_FOUND_FILE, status_code=404)
-
-    target = STATIC_HTML_DIR / full_path
-
-    if target.is_dir():
-        target = target / "index.html"
-    elif target.suffix == "":
-        html_candidate = target.with_suffix(".html")
-        if html_candidate.exists():
-            target = html_candidate
-
-    if not target.exists():
-        return FileResponse(NOT_FOUND_FILE, status_code=404)
+        return _serve(request, None)
 
-    return FileResponse(target)
+    return _serve(request, manifest.page(full_path))
@@ -1,7 +1,6 @@
-from fastapi import APIRouter, HTTPException, Depends
-from datetime import date
-from typing import List, Dict, DefaultDict
-from collections import defaultdict
+from fastapi import APIRouter, HTTPException, Depends, Query
+from datetime import date, timedelta
+from typing import List, Optional
 from tortoise.exceptions import DoesNotExist
 
 from src.model.schema.token import (
@@ -9,11 +8,14 @@ from src.model.schema.token import (
     TokenResponse,
 )
 import config
-from src.model.schema.user import UserCreate, UserResponse, CalendarEntry
+from src.model.schema.user import UserCreate, UserResponse, CalendarEntry, MonthStats, UserStatsResponse
 from src.model.users import User
 from src.model.posts import Post
+from src.model.stats import UserMonthCount, UserStats
 from fastapi.security import OAuth2PasswordRequestForm
 from src.tools.jwt import get_current_user, create_access_token, create_refresh_token, decode_token
+from src.tools.sql_functions import GroupConcat
+from src.tools.user_stats import current_streak, writing_rate
 router = APIRouter(
     prefix="/api/v1/users",
     tags=["user"],
@@ -27,7 +29,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     except DoesNotExist:
         raise HTTPException(status_code=400, detail="Invalid login ID or password")
 
-    if not user.verify_password(form_data.password):
+    if not await user.verify_password_async(form_data.password):
         raise HTTPException(status_code=400, detail="Invalid login ID or password")
 
     access_token = create_access_token(user.id)
@@ -51,12 +53,42 @@ async def refresh_tokens(request: TokenRefreshRequest):
         refresh_expires_in=config.jwt_refresh_day * 24 * 60 * 60
     )
 
-@router.post("/me", response_model=UserResponse)
-async def get_user(user: User = Depends(get_current_user)):
+async def _get_stats(user: User) -> UserStats:
+    # 게시글을 쓴 적이 없으면 통계 row 가 없으므로 0 으로 채운 객체를 돌려줌
+    return await UserStats.get_or_none(user_id=user.id) or UserStats(user_id=user.id)
+
+async def user_response(user: User) -> UserResponse:
+    stats = await _get_stats(user)
     return UserResponse(
         id=user.id,
         username=user.username,
-        number_of_posts=user.number_of_posts,
+        number_of_posts=stats.total_posts,
+        days_written=stats.days_written,
+        current_streak=current_streak(stats),
+        longest_streak=stats.longest_streak,
+    )
+
+@router.post("/me", response_model=UserResponse)
+async def get_user(user: User = Depends(get_current_user)):
+    return await user_response(user)
+
+@router.get("/stats", response_model=UserStatsResponse)
+async def get_user_stats(user: User = Depends(get_current_user)):
+    stats = await _get_stats(user)
+    months = await UserMonthCount.filter(user_id=user.id).order_by("month").values_list(
+        "month", "post_count", "days_written"
+    )
+    return UserStatsResponse(
+        total_posts=stats.total_posts,
+        days_written=stats.days_written,
+        current_streak=current_streak(stats),
+        longest_streak=stats.longest_streak,
+        last_post_date=stats.last_post_date,
+        writing_rate=writing_rate(stats, user.created_at.date()),
+        months=[
+            MonthStats(month=month, post_count=post_count, days_written=days_written)
+            for month, post_count, days_written in months
+        ],
     )
 
 @router.post("/", response_model=UserResponse)
@@ -65,7 +97,7 @@ async def create_user(user_create: UserCreate):
         raise HTTPException(status_code=400, detail="Login ID already registered")
 
     user = User(username=user_create.username, login_id=user_create.login_id)
-    user.set_password(user_create.password)
+    await user.set_password_async(user_create.password)
     await user.save()
     return UserResponse(
         id=user.id,
@@ -73,14 +105,42 @@ async def create_user(user_create: UserCreate):
         number_of_posts=user.number_of_posts,
     )
 
+def month_range(month: str) -> tuple[date, date]:
+    try:
+        first_day = date.fromisoformat(f"{month}-01")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="month must be YYYY-MM")
+    next_month = (first_day + timedelta(days=32)).replace(day=1)
+    return first_day, next_month - timedelta(days=1)
+
 @router.get("/calender", response_model=List[CalendarEntry])
-async def get_calender(user: User = Depends(get_current_user)):
-    rows = (
-        await Post.filter(author=user)
-        .values_list("date", "id")
+async def get_calender(
+    date_from: Optional[date] = Query(None, alias="from", description="First date to include"),
+    date_to: Optional[date] = Query(None, alias="to", description="Last date to include"),
+    month: Optional[str] = Query(None, description="YYYY-MM, shorthand for from/to"),
+    user: User = Depends(get_current_user),
+):
+    if month is not None:
+        if date_from is not None or date_to is not None:
+            raise HTTPException(status_code=400, detail="Use either month or from/to")
+        date_from, date_to = month_range(month)
+    return await calendar_entries(user, date_from, date_to)
+
+async def calendar_entries(user: User, date_from: Optional[date], date_to: Optional[date]) -> List[CalendarEntry]:
+    posts_query = Post.filter(author=user)
+    if date_from is not None:
+        posts_query = posts_query.filter(date__gte=date_from)
+    if date_to is not None:
+        posts_query = posts_query.filter(date__lte=date_to)
+
+    # 날짜별 묶기는 DB 에서 GROUP BY 로 처리하고, 하루치 id 목록만 파이썬에서 풀어냄
+    rows = await (
+        posts_query.annotate(post_ids=GroupConcat("id"))
+        .group_by("date")
+        .order_by("date")
+        .values_list("date", "post_ids")
     )
-    bucket: DefaultDict[date, List[int]] = defaultdict(list)
-    for d, pid in rows:
-        if pid not in bucket[d]:
-            bucket[d].append(pid)
-    return [CalendarEntry(date=d, post_ids=pids) for d, pids in bucket.items()]
+    return [
+        CalendarEntry(date=d, post_ids=sorted(int(pid) for pid in str(pids).split(",")))
+        for d, pids in rows
+    ]
@@ -0,0 +1,120 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import AsyncIterable, Iterable, List, Optional, Sequence, Set, Type, Union
+
+from tortoise.models import Model
+from tortoise.transactions import in_transaction
+
+from src.tools.database import WRITE_CONNECTION
+
+
+@dataclass
+class ImportStats:
+    read: int = 0
+    created: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.read} rows read, {self.created} created, {self.skipped} skipped "
+            f"in {self.elapsed:.2f}s ({self.rows_per_second:,.0f} rows/s)"
+        )
+
+
+def _row_key(values: Sequence[object]) -> bytes:
+    # 본문 전체를 set 에 들고 있지 않도록 16바이트 해시만 보관
+    joined = "\x1f".join("" if value is None else str(value) for value in values)
+    return hashlib.blake2b(joined.encode("utf-8"), digest_size=16).digest()
+
+
+async def _existing_keys(model: Type[Model], key_fields: Sequence[str]) -> Set[bytes]:
+    rows = await model.all().values_list(*key_fields)
+    return {_row_key(row) for row in rows}
+
+
+async def _iterate(records: Union[Iterable[dict], AsyncIterable[dict]]):
+    if hasattr(records, "__aiter__"):
+        async for record in records:
+            yield record
+    else:
+        for record in records:
+            yield record
+
+
+async def bulk_insert_missing(
+    model: Type[Model],
+    records: Union[Iterable[dict], AsyncIterable[dict]],
+    key_fields: Sequence[str],
+    batch_size: int = 1000,
+) -> ImportStats:
+    """
+    records 를 스트리밍으로 읽으면서 key_fields 기준으로 DB/입력 안의 중복을 걸러내고,
+    batch_size 개씩 하나의 트랜잭션 안에서 bulk_create 한다.
+    """
+    stats = ImportStats()
+    started = time.perf_counter()
+    seen = await _existing_keys(model, key_fields)
+    batch: List[Model] = []
+
+    async def flush() -> None:
+        if not batch:
+            return
+        async with in_transaction(WRITE_CONNECTION):
+            await model.bulk_create(batch)
+        stats.created += len(batch)
+        batch.clear()
+
+    async for record in _iterate(records):
+        stats.read += 1
+        key = _row_key([record.get(field) for field in key_fields])
+        if key in seen:
+            stats.skipped += 1
+            continue
+        seen.add(key)
+        batch.append(model(**record))
+        if len(batch) >= batch_size:
+            await flush()
+    await flush()
+
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+async def bulk_upsert(
+    model: Type[Model],
+    records: Iterable[dict],
+    conflict_fields: Sequence[str],
+    update_fields: Optional[Sequence[str]] = None,
+    batch_size: int = 1000,
+) -> ImportStats:
+    """
+    conflict_fields 에 걸린 유니크 제약을 기준으로 records 를 한 트랜잭션 안에서 batch_size 개씩 넣는다.
+    이미 있는 row 는 update_fields 가 주어지면 그 필드만 갱신하고, 아니면 그대로 둔다.
+    같은 입력으로 여러 번 실행해도 결과가 같다.
+    """
+    stats = ImportStats()
+    started = time.perf_counter()
+    objects = [model(**record) for record in records]
+    stats.read = len(objects)
+    async with in_transaction(WRITE_CONNECTION) as connection:
+        before = await model.all().using_db(connection).count()
+        if update_fields:
+            await model.bulk_create(
+                objects,
+                batch_size=batch_size,
+                update_fields=update_fields,
+                on_conflict=conflict_fields,
+                using_db=connection,
+            )
+        else:
+            await model.bulk_create(objects, batch_size=batch_size, ignore_conflicts=True, using_db=connection)
+        stats.created = await model.all().using_db(connection).count() - before
+    stats.skipped = stats.read - stats.created
+    stats.elapsed = time.perf_counter() - started
+    return stats
@@ -0,0 +1,102 @@
+"""
+Tortoise 연결 설정. SQLite 파일 DB 면 운영용 PRAGMA 를 걸고,
+쓰기는 연결 하나(default)로 직렬화하면서 읽기는 별도의 읽기 전용 연결들에 나눠 보낸다 (WAL 이라 쓰는 중에도 읽기 가능).
+"""
+import copy
+import itertools
+import sqlite3
+from typing import List, Optional, Type
+
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.backends.base.config_generator import expand_db_url
+from tortoise.connection import connections as registered_connections
+from tortoise.models import Model
+from tortoise.router import router
+
+from config import db_read_connections, sqlite_busy_timeout, sqlite_cache_size, sqlite_mmap_size
+
+WRITE_CONNECTION = "default"
+READ_CONNECTION_PREFIX = "read"
+
+# Tortoise.init 에 넘길 모델 모듈 목록 (서버, 마이그레이션, CLI, 스크립트가 모두 이 목록을 씀)
+MODELS = ["src.model.users", "src.model.posts", "src.model.quotes", "src.model.questions", "src.model.bookmarks", "src.model.images", "src.model.stats"]
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL", # WAL 에서는 체크포인트 때만 fsync 해도 DB 가 깨지지 않음
+    "busy_timeout": sqlite_busy_timeout,
+    "cache_size": -sqlite_cache_size, # 음수는 KiB 단위
+    "mmap_size": sqlite_mmap_size,
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
+
+
+def _is_sqlite_file(connection: dict) -> bool:
+    return (
+        connection["engine"] == "tortoise.backends.sqlite"
+        and connection["credentials"].get("file_path") not in (None, "", ":memory:")
+    )
+
+
+def _read_connection_names(count: int) -> List[str]:
+    return [f"{READ_CONNECTION_PREFIX}{index}" for index in range(count)]
+
+
+class ReadWriteRouter:
+    """Tortoise 라우터: 쓰기는 항상 default, 읽기는 읽기 전용 연결들을 돌아가며 사용."""
+
+    def __init__(self) -> None:
+        # Tortoise.init 이 연결을 등록한 뒤 인자 없이 만들므로, 읽기 연결 목록은 등록된 연결 이름에서 가져옴
+        readers = [name for name in registered_connections.db_config if name.startswith(READ_CONNECTION_PREFIX)]
+        self._readers = itertools.cycle(readers or [WRITE_CONNECTION])
+
+    def db_for_read(self, model: Type[Model]) -> str:
+        return next(self._readers)
+
+    def db_for_write(self, model: Type[Model]) -> str:
+        return WRITE_CONNECTION
+
+
+def tortoise_config(db_url: str, models: List[str], read_connections: int = db_read_connections) -> dict:
+    """Tortoise.init(config=...) 에 넘길 설정. URL 에 직접 적은 PRAGMA 가 기본값보다 우선한다."""
+    writer = expand_db_url(db_url)
+    connections = {WRITE_CONNECTION: writer}
+    routers: List[str] = []
+    if _is_sqlite_file(writer):
+        credentials = writer["credentials"]
+        for pragma, value in SQLITE_PRAGMAS.items():
+            credentials.setdefault(pragma, value)
+        if read_connections > 0:
+            for name in _read_connection_names(read_connections):
+                reader = copy.deepcopy(writer)
+                # 실수로 읽기 연결에서 쓰기가 일어나면 바로 에러가 나도록 함
+                reader["credentials"]["query_only"] = "ON"
+                connections[name] = reader
+            routers.append(f"{__name__}.ReadWriteRouter")
+    return {
+        "connections": connections,
+        "apps": {"models": {"models": models, "default_connection": WRITE_CONNECTION}},
+        "routers": routers,
+    }
+
+
+def read_connection(model: Type[Model]) -> BaseDBAsyncClient:
+    """raw SQL 로 읽기만 하는 곳에서 쓸 연결. 라우터가 없으면 모델의 기본 연결."""
+    db: Optional[BaseDBAsyncClient] = router.db_for_read(model)
+    return db or model._meta.db
+
+
+async def execute_statements(conn: BaseDBAsyncClient, script: str) -> None:
+    """
+    여러 문장으로 된 SQL 을 한 문장씩 execute_query 로 실행한다. execute_script (sqlite3 executescript) 는
+    실행 전에 COMMIT 부터 해서 트랜잭션 안에서 써도 롤백되지 않으므로, 트랜잭션 안의 DDL 은 이걸로 실행.
+    """
+    statement = ""
+    # 트리거 본문이나 문자열 안의 ; 에서 끊기지 않도록 완성된 문장인지 sqlite3 로 확인하면서 이어 붙임
+    for part in script.split(";"):
+        statement += part + ";"
+        if sqlite3.complete_statement(statement):
+            if statement.strip(" \t\r\n;"):
+                await conn.execute_query(statement.strip())
+            statement = ""
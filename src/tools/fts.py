@@ -0,0 +1,22 @@
+import html
+from typing import Optional
+
+# snippet/highlight 의 표시 문자. 본문을 HTML escape 한 다음 <mark> 로 바꿔서 본문 속 태그가 그대로 나가지 않게 함
+MARK_START = "\x02"
+MARK_END = "\x03"
+
+
+def match_query(query: str) -> Optional[str]:
+    """
+    사용자 입력을 FTS5 MATCH 식으로 바꾼다. 검색어가 없으면 None.
+    unicode61 토크나이저는 공백 기준으로 나누므로 각 검색어를 접두어 검색("일기"*)으로 바꿔서
+    조사가 붙은 한국어 단어(일기를, 일기에서)도 찾도록 함.
+    """
+    terms = [term.replace('"', '""') for term in query.split() if term.replace('"', "")]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def render_marks(text: Optional[str]) -> str:
+    return html.escape(text or "").replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
@@ -0,0 +1,69 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from config import password_hash_concurrency, password_hash_workers
+
+T = TypeVar("T")
+
+
+class HashPool:
+    """
+    비밀번호 해시처럼 CPU 를 오래 쓰는 동기 함수를 이벤트 루프 밖의 전용 스레드 풀에서 실행한다.
+    pbkdf2 는 hashlib 안에서 GIL 을 풀기 때문에 스레드로도 병렬 처리가 된다.
+    세마포어로 동시에 돌아가는 작업 수를 제한하고, 대기열 길이를 지표로 남긴다.
+    """
+
+    def __init__(self, workers: int, concurrency: int):
+        self.workers = workers
+        self.concurrency = concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.max_waiting = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await self._get_semaphore().acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self._get_semaphore().release()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "concurrency": self.concurrency,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "running": self.running,
+            "completed": self.completed,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+hash_pool = HashPool(workers=password_hash_workers, concurrency=password_hash_concurrency)
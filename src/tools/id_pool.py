@@ -0,0 +1,144 @@
+import asyncio
+import bisect
+import logging
+import random
+import time
+from array import array
+from typing import Generic, Optional, Set, Type, TypeVar
+
+from tortoise.models import Model
+from tortoise.signals import post_delete, post_save
+
+from config import id_pool_ttl
+from src.model.questions import Question
+from src.model.quotes import Quote
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=Model)
+
+# 지워진 pk 를 연달아 뽑았을 때 배열을 정리하기 전까지 다시 고르는 횟수
+CHOICE_ATTEMPTS = 8
+
+
+class IdPool(Generic[ModelT]):
+    """
+    모델의 pk 목록을 메모리에 들고 있다가 랜덤 pk 하나를 골라 단건 조회하는 샘플러.
+    COUNT(*) + OFFSET 스캔 대신 O(1) 선택 + pk 조회 한 번으로 끝난다.
+    """
+
+    def __init__(self, model: Type[ModelT]):
+        self.model = model
+        # pk 오름차순, 중복 없음 (refresh 는 pk 순으로 불러오고 add 는 정렬을 유지하며 넣음)
+        self._ids = array("q")
+        # 삭제된 pk 는 배열에서 바로 빼지 않고 여기 모아뒀다가 고를 때 건너뛰고, 많아지면 한 번에 정리
+        self._removed: Set[int] = set()
+        self._loaded_at = 0.0
+        self._refreshing: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return max(len(self._ids) - len(self._removed), 0)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at > 0
+
+    @property
+    def is_stale(self) -> bool:
+        return time.monotonic() - self._loaded_at > id_pool_ttl
+
+    async def refresh(self) -> None:
+        ids = await self.model.all().order_by("id").values_list("id", flat=True)
+        self._ids = array("q", ids)
+        self._removed = set()
+        self._loaded_at = time.monotonic()
+
+    def refresh_soon(self) -> asyncio.Task:
+        """백그라운드에서 refresh. 이미 불러오는 중이면 새로 시작하지 않고 그 작업을 돌려준다."""
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.create_task(self.refresh())
+            self._refreshing.add_done_callback(self._log_refresh_failure)
+        return self._refreshing
+
+    def _log_refresh_failure(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Failed to refresh %s id pool", self.model.__name__, exc_info=task.exception())
+
+    def add(self, pk: int) -> None:
+        self._removed.discard(pk)
+        # 새 pk 는 보통 가장 커서 끝에 붙이면 되고, 그 외에는 이분 탐색으로 이미 있는지 확인 (refresh 가 불러온 pk 의 시그널 등)
+        if not self._ids or pk > self._ids[-1]:
+            self._ids.append(pk)
+            return
+        index = bisect.bisect_left(self._ids, pk)
+        if self._ids[index] != pk:
+            self._ids.insert(index, pk)
+
+    def discard(self, pk: int) -> None:
+        self._removed.add(pk)
+
+    def _compact(self) -> None:
+        self._ids = array("q", (pk for pk in self._ids if pk not in self._removed))
+        self._removed = set()
+
+    def _choice(self) -> Optional[int]:
+        if len(self._removed) * 2 > len(self._ids):
+            self._compact()
+        # 지워진 pk 는 대개 절반 이하라 몇 번 안에 남아있는 pk 가 뽑힘. 계속 지워진 pk 만 나오면 정리하고 다시 고름
+        for _ in range(CHOICE_ATTEMPTS):
+            if not self._ids:
+                return None
+            pk = random.choice(self._ids)
+            if pk not in self._removed:
+                return pk
+        self._compact()
+        return random.choice(self._ids) if self._ids else None
+
+    async def pick(self) -> Optional[ModelT]:
+        if not self.loaded:
+            # 아직 한 번도 못 불러왔으면 기다림 (동시에 들어온 요청은 같은 작업을 기다리고, 요청이 취소돼도 로딩은 계속)
+            await asyncio.shield(self.refresh_soon())
+        elif self.is_stale:
+            # 다른 프로세스(임포트 스크립트 등)에서 바뀐 내용은 TTL 이 지나면 백그라운드에서 반영하고, 그동안은 지금 목록으로 고름
+            self.refresh_soon()
+        for _ in range(2):
+            pk = self._choice()
+            if pk is None:
+                return None
+            result = await self.model.get_or_none(id=pk)
+            if result is not None:
+                return result
+            # 풀에 남아있던 id 가 다른 프로세스에서 이미 삭제된 경우 빼고 다른 id 로 재시도
+            self.discard(pk)
+            self.refresh_soon()
+        return None
+
+
+quote_pool: IdPool[Quote] = IdPool(Quote)
+question_pool: IdPool[Question] = IdPool(Question)
+
+POOLS = (quote_pool, question_pool)
+
+
+async def load_pools(only_missing: bool = False) -> None:
+    # prefork 워커는 마스터가 fork 전에 불러둔 풀을 그대로 쓰도록 only_missing 으로 부름
+    for pool in POOLS:
+        if only_missing and pool.loaded:
+            continue
+        await pool.refresh()
+
+
+# 같은 프로세스 안에서 생성/삭제되는 row 는 시그널로 바로 반영
+def _register_signals(pool: IdPool) -> None:
+    @post_save(pool.model)
+    async def _on_save(sender, instance, created, using_db, update_fields) -> None:
+        if created:
+            pool.add(instance.pk)
+
+    @post_delete(pool.model)
+    async def _on_delete(sender, instance, using_db) -> None:
+        pool.discard(instance.pk)
+
+
+for _pool in POOLS:
+    _register_signals(_pool)
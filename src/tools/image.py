@@ -1,33 +1,227 @@
+import hashlib
 from fastapi import HTTPException, UploadFile, status
 from pathlib import Path
+from typing import Optional
 from uuid import uuid4
-from config import storage_path
 
-async def _process_image(upload: UploadFile, user_id: int) -> str:
-    if not upload.filename:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Image file requires a filename.",
-        )
-    img_extenstions = [".jpg", ".jpeg", ".png", ".gif", ".webp"]
-    extension = Path(upload.filename).suffix
-    if extension.lower() not in img_extenstions:
+import aiofiles
+import aiofiles.os
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from config import image_chunk_size, max_image_size, storage_path
+from src.model.images import ImageBlob
+from src.tools.thumbnail import remove_derivatives
+
+# 확장자별 매직 바이트 (webp 는 RIFF 컨테이너라 따로 검사)
+_MAGIC_BYTES = {
+    ".jpg": (b"\xff\xd8\xff",),
+    ".png": (b"\x89PNG\r\n\x1a\n",),
+    ".gif": (b"GIF87a", b"GIF89a"),
+}
+_SNIFF_SIZE = 12
+
+BLOB_DIR = Path(storage_path) / "blobs"
+_TEMP_DIR = BLOB_DIR / "tmp"
+
+def _sniff_extension(head: bytes) -> Optional[str]:
+    for extension, signatures in _MAGIC_BYTES.items():
+        if head.startswith(signatures):
+            return extension
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    return None
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Image file exceeds {max_image_size} bytes",
+    )
+
+
+def blob_path(digest: str, extension: str) -> Path:
+    # storage/blobs/ab/cd/abcd....ext - 한 디렉토리에 파일이 몰리지 않도록 두 단계로 나눔
+    return BLOB_DIR / digest[:2] / digest[2:4] / f"{digest}{extension}"
+
+
+def _blob_hash(image_url: str) -> Optional[str]:
+    path = Path(image_url)
+    try:
+        path.relative_to(BLOB_DIR)
+    except ValueError:
+        return None
+    return path.stem
+
+
+async def _hash_upload(upload: UploadFile) -> tuple[str, str, int]:
+    """업로드를 한 번 훑으면서 형식 확인, 크기 제한, sha256 계산을 한다 (디스크 쓰기 없음)."""
+    digest = hashlib.sha256()
+    extension: Optional[str] = None
+    size = 0
+    while chunk := await upload.read(image_chunk_size):
+        if extension is None:
+            extension = _sniff_extension(chunk[:_SNIFF_SIZE])
+            if extension is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid image file",
+                )
+        size += len(chunk)
+        if size > max_image_size:
+            raise _too_large()
+        digest.update(chunk)
+    if extension is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid image file"
+            detail="Image file is empty",
         )
-    image_dir = Path(storage_path) / "posts" / str(user_id)
-    image_dir.mkdir(parents=True, exist_ok=True)
-    destination = image_dir / f"{uuid4().hex}{extension}"
+    return digest.hexdigest(), extension, size
+
+
+async def _write_blob(upload: UploadFile, destination: Path) -> None:
+    await upload.seek(0)
+    _TEMP_DIR.mkdir(parents=True, exist_ok=True)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = _TEMP_DIR / f"{uuid4().hex}.part"
     try:
-        contents = await upload.read()
-        with destination.open("wb") as buffer:
-            buffer.write(contents)
-    except Exception as exc:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to store image file: {exc}",
-        ) from exc
-    finally:
-        await upload.close()
-    return str(destination)
\ No newline at end of file
+        # 청크 단위로 임시 파일에 쓰고, 다 받은 뒤에 rename 해서 반쯤 써진 파일이 보이지 않도록 함
+        async with aiofiles.open(temp_path, "wb") as buffer:
+            while chunk := await upload.read(image_chunk_size):
+                await buffer.write(chunk)
+        await aiofiles.os.replace(temp_path, destination)
+    except BaseException:
+        await _remove_quietly(temp_path)
+        raise
+
+
+class StagedImage:
+    """
+    업로드를 검사해서 blob 파일로 저장해 두는 async 컨텍스트 매니저. 참조 수는 게시글을 저장하는 트랜잭션 안에서
+    acquire_image 로 올리고, 빠져나올 때 참조가 남아 있으면 파일이 있도록, 없으면 (트랜잭션 실패) 파일을 정리한다.
+    """
+
+    def __init__(self, upload: UploadFile):
+        self.upload = upload
+        self.digest = ""
+        self.extension = ""
+        self.size = 0
+
+    @property
+    def path(self) -> Path:
+        return blob_path(self.digest, self.extension)
+
+    @property
+    def url(self) -> str:
+        return str(self.path)
+
+    async def __aenter__(self) -> "StagedImage":
+        try:
+            await self._store()
+        except BaseException:
+            await self.upload.close()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        try:
+            if await ImageBlob.filter(hash=self.digest).exists():
+                # 다른 프로세스가 마지막 참조를 지우면서 파일을 치웠을 수 있으니 다시 확인
+                if not await aiofiles.os.path.exists(self.path):
+                    await _write_blob(self.upload, self.path)
+            else:
+                await remove_image_file(self.path)
+        finally:
+            await self.upload.close()
+
+    async def _store(self) -> None:
+        upload = self.upload
+        if not upload.filename:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Image file requires a filename.",
+            )
+        img_extenstions = [".jpg", ".jpeg", ".png", ".gif", ".webp"]
+        extension = Path(upload.filename).suffix
+        if extension.lower() not in img_extenstions:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid image file"
+            )
+        # 멀티파트 파싱 단계에서 크기를 이미 알고 있으면 읽기 전에 바로 거절
+        if upload.size is not None and upload.size > max_image_size:
+            raise _too_large()
+
+        try:
+            self.digest, self.extension, self.size = await _hash_upload(upload)
+            # 이미 있는 파일이면 디스크에는 아무것도 쓰지 않음
+            if not await aiofiles.os.path.exists(self.path):
+                await _write_blob(upload, self.path)
+        except HTTPException:
+            raise
+        except Exception as exc:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to store image file: {exc}",
+            ) from exc
+
+
+async def acquire_image(conn: BaseDBAsyncClient, image: StagedImage) -> None:
+    """게시글에 이미지를 거는 트랜잭션 안에서 호출. blob 행이 없으면 만들고 있으면 참조 수를 올린다."""
+    await conn.execute_query(
+        'INSERT INTO "imageblob" ("hash", "extension", "size", "ref_count") VALUES (?, ?, ?, 1) '
+        'ON CONFLICT ("hash") DO UPDATE SET "ref_count" = "ref_count" + 1',
+        [image.digest, image.extension, image.size],
+    )
+
+
+async def release_image(conn: BaseDBAsyncClient, image_url: Optional[str]) -> Optional[Path]:
+    """
+    게시글이 이미지를 더 이상 쓰지 않게 되는 트랜잭션 안에서 호출. 이 트랜잭션이 마지막 참조를 지웠으면
+    커밋한 뒤 remove_image_file 로 지울 파일 경로를 반환한다.
+    """
+    if not image_url:
+        return None
+    path = Path(image_url)
+    digest = _blob_hash(image_url)
+    if digest is None:
+        # blob 저장소 도입 전에 올라간 개별 파일은 게시글 하나만 씀
+        return path
+    rows = await conn.execute_query_dict(
+        'UPDATE "imageblob" SET "ref_count" = "ref_count" - 1 WHERE "hash" = ? RETURNING "ref_count"', [digest]
+    )
+    if not rows or rows[0]["ref_count"] > 0:
+        return None
+    await conn.execute_query('DELETE FROM "imageblob" WHERE "hash" = ?', [digest])
+    return path
+
+
+async def remove_image_file(path: Optional[Path]) -> None:
+    """
+    커밋 뒤에 참조가 없는 이미지 파일과 파생 이미지를 지운다. 그 사이 같은 내용이 다시 올라왔을 수 있으므로
+    파일을 먼저 옮겨 두고 blob 행을 확인해서, 다시 참조되고 있으면 되돌린다 (내용 주소라 덮어써도 같은 파일).
+    """
+    if path is None:
+        return
+    digest = _blob_hash(str(path))
+    if digest is None:
+        await _remove_quietly(path)
+        remove_derivatives(path)
+        return
+    _TEMP_DIR.mkdir(parents=True, exist_ok=True)
+    removed = _TEMP_DIR / f"{uuid4().hex}.removed"
+    try:
+        await aiofiles.os.replace(path, removed)
+    except FileNotFoundError:
+        return
+    if await ImageBlob.filter(hash=digest).exists():
+        await aiofiles.os.replace(removed, path)
+        return
+    await _remove_quietly(removed)
+    remove_derivatives(path)
+
+
+async def _remove_quietly(path: Path) -> None:
+    try:
+        await aiofiles.os.remove(path)
+    except FileNotFoundError:
+        pass
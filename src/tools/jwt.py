@@ -1,14 +1,14 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from src.model.users import User
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
 from pydantic import BaseModel
 import config
+from src.tools.token_cache import token_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/users/login")
 
@@ -23,6 +23,9 @@ class _TokenConfig(BaseModel):
     scopes: List[str]
 
 def _create_token(*, id: int, scopes: Optional[List[str]] = None, minutes: int, token_type: str) -> str:
+    # jose 는 cryptography 백엔드까지 불러와서 import 가 무거움. 서버 시작 때가 아니라 토큰을 처음 다룰 때 불러옴
+    from jose import jwt
+
     to_encode = {
         "sub": str(id),
         "type": token_type,
@@ -48,6 +51,12 @@ def create_refresh_token(id:int, scopes: Optional[List[str]] = None) -> str:
     )
 
 def decode_token(token: str, expected_type: str) -> _TokenConfig:
+    token_config, _ = _decode_token_with_exp(token, expected_type)
+    return token_config
+
+def _decode_token_with_exp(token: str, expected_type: str) -> Tuple[_TokenConfig, int]:
+    from jose import JWTError, jwt
+
     payload: dict
     try:
         payload = jwt.decode(token, config.jwt_secret_key, algorithms=[config.jwt_algorithm])
@@ -70,10 +79,15 @@ def decode_token(token: str, expected_type: str) -> _TokenConfig:
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return _TokenConfig(id=user_id, scopes=payload.get("scopes", []))
+    return _TokenConfig(id=user_id, scopes=payload.get("scopes", [])), int(payload.get("exp", 0))
 
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
-    token_config = decode_token(token, expected_type="access")
+    # 최근에 검증한 토큰이면 jwt.decode 와 User 조회를 건너뜀
+    cached = token_cache.get(token)
+    if cached is not None:
+        return token_cache.build_user(cached)
+
+    token_config, exp = _decode_token_with_exp(token, expected_type="access")
     result = await User.filter(id=token_config.id).first()
     if result is None:
         raise HTTPException(
@@ -81,4 +95,6 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    token_cache.put(token, token_config, result, exp)
     return result
+
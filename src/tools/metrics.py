@@ -0,0 +1,316 @@
+"""
+요청 지표. ASGI 미들웨어가 라우트 템플릿 (/api/v1/posts/{post_id}) 별로 응답 시간, 상태 코드, 처리 중인 요청 수를 모으고,
+Tortoise 클라이언트의 execute_* 를 감싸서 요청마다 실행한 쿼리 수와 DB 시간을 센다.
+/metrics 에서 Prometheus 텍스트 형식으로 내보내고, SLOW_REQUEST_MS 보다 오래 걸린 요청은 쿼리 목록과 함께 로그로 남긴다.
+
+prefork 워커는 주기적으로 자기 지표를 공유 디렉토리에 써두고, /metrics 를 받은 워커가 전부 합쳐서 응답한다.
+"""
+import asyncio
+import functools
+import logging
+import os
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import orjson
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from config import slow_request_ms
+from src.tools.prefork import live_pids, shared_dir
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# 임의의 메서드 이름으로 라벨 수가 늘어나지 않도록 나머지는 OTHER 로 묶음
+METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"))
+DB_METHODS = ("execute_insert", "execute_many", "execute_query", "execute_query_dict", "execute_script")
+# 느린 요청 로그에 남길 쿼리 수와 쿼리 길이
+MAX_LOGGED_QUERIES = 50
+MAX_QUERY_LENGTH = 300
+PUBLISH_INTERVAL = 5.0
+
+RouteKey = Tuple[str, str]
+
+
+class RequestStats:
+    """요청 하나가 실행한 쿼리. 미들웨어가 contextvar 로 넘기고 DB 훅이 채운다."""
+
+    __slots__ = ("query_count", "db_seconds", "queries")
+
+    def __init__(self) -> None:
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.queries: List[Tuple[str, float]] = []
+
+    def add_query(self, sql: str, seconds: float) -> None:
+        self.query_count += 1
+        self.db_seconds += seconds
+        if len(self.queries) < MAX_LOGGED_QUERIES:
+            self.queries.append((sql, seconds))
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, counts: Sequence[int], total: float, count: int) -> None:
+        self.counts = [a + b for a, b in zip(self.counts, counts)]
+        self.sum += total
+        self.count += count
+
+
+class RequestMetrics:
+    def __init__(self) -> None:
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        self.slow: Dict[RouteKey, int] = {}
+        self.latency: Dict[RouteKey, Histogram] = {}
+        self.db_queries: Dict[RouteKey, Histogram] = {}
+        self.db_seconds: Dict[RouteKey, Histogram] = {}
+        self.in_flight = 0
+
+    @staticmethod
+    def _histogram(table: Dict[RouteKey, Histogram], key: RouteKey, buckets: Sequence[float]) -> Histogram:
+        histogram = table.get(key)
+        if histogram is None:
+            histogram = table[key] = Histogram(buckets)
+        return histogram
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats, slow: bool) -> None:
+        key = (method, route)
+        request_key = (method, route, str(status))
+        self.requests[request_key] = self.requests.get(request_key, 0) + 1
+        if slow:
+            self.slow[key] = self.slow.get(key, 0) + 1
+        self._histogram(self.latency, key, LATENCY_BUCKETS).observe(seconds)
+        self._histogram(self.db_queries, key, QUERY_COUNT_BUCKETS).observe(stats.query_count)
+        self._histogram(self.db_seconds, key, LATENCY_BUCKETS).observe(stats.db_seconds)
+
+    # --- 워커 간 합산 ---
+
+    def snapshot(self) -> dict:
+        def histograms(table: Dict[RouteKey, Histogram]) -> list:
+            return [[*key, histogram.counts, histogram.sum, histogram.count] for key, histogram in table.items()]
+
+        return {
+            "requests": [[*key, count] for key, count in self.requests.items()],
+            "slow": [[*key, count] for key, count in self.slow.items()],
+            "latency": histograms(self.latency),
+            "db_queries": histograms(self.db_queries),
+            "db_seconds": histograms(self.db_seconds),
+            "in_flight": self.in_flight,
+        }
+
+    def merge(self, snapshot: dict, include_in_flight: bool) -> None:
+        for method, route, status, count in snapshot["requests"]:
+            self.requests[(method, route, status)] = self.requests.get((method, route, status), 0) + count
+        for method, route, count in snapshot["slow"]:
+            self.slow[(method, route)] = self.slow.get((method, route), 0) + count
+        for name, buckets in (("latency", LATENCY_BUCKETS), ("db_queries", QUERY_COUNT_BUCKETS), ("db_seconds", LATENCY_BUCKETS)):
+            table = getattr(self, name)
+            for method, route, counts, total, count in snapshot[name]:
+                self._histogram(table, (method, route), buckets).merge(counts, total, count)
+        if include_in_flight:
+            self.in_flight += snapshot["in_flight"]
+
+
+request_metrics = RequestMetrics()
+
+
+# --- Prometheus 텍스트 형식 ---
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Iterable[str], values: Iterable[str]) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _render_histogram(lines: List[str], name: str, help_text: str, table: Dict[RouteKey, Histogram]) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key, histogram in sorted(table.items()):
+        labels = _labels(("method", "route"), key)
+        cumulative = 0
+        for bound, count in zip([*histogram.buckets, "+Inf"], histogram.counts):
+            cumulative += count
+            le = bound if bound == "+Inf" else _format_number(float(bound))
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {_format_number(histogram.sum)}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+def render(metrics: RequestMetrics) -> str:
+    lines: List[str] = [
+        "# HELP http_requests_total Requests by route template and status code.",
+        "# TYPE http_requests_total counter",
+    ]
+    for key, count in sorted(metrics.requests.items()):
+        lines.append(f"http_requests_total{{{_labels(('method', 'route', 'status'), key)}}} {count}")
+    lines.append(f"# HELP http_slow_requests_total Requests slower than {slow_request_ms}ms.")
+    lines.append("# TYPE http_slow_requests_total counter")
+    for key, count in sorted(metrics.slow.items()):
+        lines.append(f"http_slow_requests_total{{{_labels(('method', 'route'), key)}}} {count}")
+    lines.append("# HELP http_requests_in_flight Requests currently being handled.")
+    lines.append("# TYPE http_requests_in_flight gauge")
+    lines.append(f"http_requests_in_flight {metrics.in_flight}")
+    _render_histogram(lines, "http_request_duration_seconds", "Request latency.", metrics.latency)
+    _render_histogram(lines, "http_request_db_queries", "Database queries per request.", metrics.db_queries)
+    _render_histogram(lines, "http_request_db_seconds", "Time spent in database queries per request.", metrics.db_seconds)
+    return "\n".join(lines) + "\n"
+
+
+def _snapshot_path(directory: str, pid: int) -> str:
+    return os.path.join(directory, f"metrics-{pid}.json")
+
+
+def publish() -> None:
+    """prefork 워커: 지금까지의 지표를 공유 디렉토리에 쓴다 (다른 워커의 /metrics 가 읽음)."""
+    directory = shared_dir()
+    if directory is None:
+        return
+    path = _snapshot_path(directory, os.getpid())
+    with open(f"{path}.tmp", "wb") as snapshot_file:
+        snapshot_file.write(orjson.dumps(request_metrics.snapshot()))
+    os.replace(f"{path}.tmp", path)
+
+
+async def publish_loop() -> None:
+    try:
+        while True:
+            await asyncio.sleep(PUBLISH_INTERVAL)
+            publish()
+    finally:
+        # 교체/종료되는 워커의 누적값도 남겨서 카운터가 줄어들지 않도록 마지막으로 한 번 더 씀
+        publish()
+
+
+def render_metrics() -> str:
+    """/metrics 응답. prefork 면 다른 워커들이 써둔 지표 (종료된 워커 포함, in-flight 는 살아있는 워커만) 를 합친다."""
+    directory = shared_dir()
+    if directory is None:
+        return render(request_metrics)
+    merged = RequestMetrics()
+    merged.merge(request_metrics.snapshot(), include_in_flight=True)
+    alive = set(live_pids())
+    own = _snapshot_path(directory, os.getpid())
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if not name.startswith("metrics-") or not name.endswith(".json") or path == own:
+            continue
+        try:
+            with open(path, "rb") as snapshot_file:
+                snapshot = orjson.loads(snapshot_file.read())
+        except (OSError, orjson.JSONDecodeError):
+            continue
+        pid = int(name[len("metrics-"):-len(".json")])
+        merged.merge(snapshot, include_in_flight=pid in alive)
+    return render(merged)
+
+
+# --- 요청/쿼리 측정 ---
+
+def _log_slow_request(method: str, path: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+    queries = "".join(
+        f"\n  {query_seconds * 1000:8.1f}ms  {sql[:MAX_QUERY_LENGTH]}" for sql, query_seconds in stats.queries
+    )
+    omitted = stats.query_count - len(stats.queries)
+    if omitted > 0:
+        queries += f"\n  ... {omitted} more"
+    logger.warning(
+        "Slow request %s %s (%s) %d in %.1fms, %d queries in %.1fms%s",
+        method, path, route, status, seconds * 1000, stats.query_count, stats.db_seconds * 1000, queries,
+    )
+
+
+class MetricsMiddleware:
+    """요청마다 응답 시간과 쿼리를 재서 request_metrics 에 모으는 ASGI 미들웨어."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status = 500  # 응답을 시작하기 전에 예외가 나면 ServerErrorMiddleware 가 500 을 보냄
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        request_metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            seconds = time.perf_counter() - started
+            request_metrics.in_flight -= 1
+            _current.reset(token)
+            method = scope["method"] if scope["method"] in METHODS else "OTHER"
+            # FastAPI 가 매칭된 라우트를 scope 에 넣어줌 (경로 파라미터 대신 템플릿으로 묶기 위해 사용)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            slow = 0 < slow_request_ms <= seconds * 1000
+            request_metrics.observe(method, route, status, seconds, stats, slow)
+            if slow:
+                _log_slow_request(method, scope["path"], route, status, seconds, stats)
+
+
+def _timed(method):
+    @functools.wraps(method)
+    async def wrapper(self, query: str, *args, **kwargs):
+        stats = _current.get()
+        if stats is None:
+            return await method(self, query, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return await method(self, query, *args, **kwargs)
+        finally:
+            stats.add_query(query, time.perf_counter() - started)
+
+    wrapper.__metrics_timed__ = True
+    return wrapper
+
+
+def _subclasses(cls: type) -> Iterable[type]:
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
+
+
+def instrument_db() -> None:
+    """
+    불러온 Tortoise DB 클라이언트들의 execute_* 를 감싸서 요청 중 실행된 쿼리를 센다.
+    ORM 쿼리 (executor) 와 직접 실행하는 SQL 이 모두 여기를 지나간다. 백엔드 모듈은 Tortoise.init 때 불러오므로 그 뒤에 호출.
+    """
+    for client_class in _subclasses(BaseDBAsyncClient):
+        for name in DB_METHODS:
+            method = vars(client_class).get(name)
+            if method is not None and not getattr(method, "__metrics_timed__", False):
+                setattr(client_class, name, _timed(method))
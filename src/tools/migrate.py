@@ -0,0 +1,201 @@
+"""
+버전별 스키마 변경. 서버는 시작할 때 스키마 버전만 확인하고, 테이블 생성과 변경은 배포 때 한 번 실행한다.
+
+    python -m src.tools.migrate            # 남은 마이그레이션 적용 (빈 DB 면 테이블부터 생성)
+    python -m src.tools.migrate --status   # 적용 여부만 확인
+"""
+import argparse
+import asyncio
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, List, Tuple, Type
+
+from tortoise import Tortoise
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.models import Model
+from tortoise.transactions import in_transaction
+
+from src.model.images import ImageBlob
+from src.model.quotes import QuoteAuthor
+from src.model.stats import UserDayCount, UserMonthCount, UserStats
+from src.tools.database import MODELS, execute_statements
+from src.tools.post_search import rebuild_index
+from src.tools.quote_search import rebuild_search
+from src.tools.user_stats import rebuild_stats
+
+Migration = Tuple[int, str, Callable[[BaseDBAsyncClient], Awaitable[None]]]
+
+VERSION_TABLE = "schema_version"
+
+
+async def _create_tables(conn: BaseDBAsyncClient, *models: Type[Model]) -> None:
+    # 새로 추가된 모델의 테이블은 모델 정의에서 DDL 을 만들어서 generate_schemas 결과와 같게 유지
+    generator = conn.schema_generator(conn)
+    for model in models:
+        await execute_statements(conn, generator._get_table_sql(model, safe=True)["table_creation_string"])
+
+
+async def _add_post_and_bookmark_indexes(conn: BaseDBAsyncClient) -> None:
+    # 유니크 인덱스를 걸기 전에 기존 중복 북마크를 하나만 남기고 정리
+    await execute_statements(
+        conn,
+        """
+        DELETE FROM "bookmark" WHERE "id" NOT IN (
+            SELECT MIN("id") FROM "bookmark" GROUP BY "user_id", "quote_id"
+        );
+        CREATE INDEX IF NOT EXISTS "idx_post_author_date" ON "post" ("author_id", "date");
+        CREATE UNIQUE INDEX IF NOT EXISTS "uidx_bookmark_user_quote" ON "bookmark" ("user_id", "quote_id");
+        """
+    )
+
+
+async def _add_image_blob_table(conn: BaseDBAsyncClient) -> None:
+    await _create_tables(conn, ImageBlob)
+
+
+async def _add_question_message_unique_index(conn: BaseDBAsyncClient) -> None:
+    await execute_statements(
+        conn,
+        """
+        DELETE FROM "question" WHERE "id" NOT IN (
+            SELECT MIN("id") FROM "question" GROUP BY "message"
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS "uidx_question_message" ON "question" ("message");
+        """
+    )
+
+
+async def _add_bookmark_created_index(conn: BaseDBAsyncClient) -> None:
+    await conn.execute_query(
+        'CREATE INDEX IF NOT EXISTS "idx_bookmark_user_created" ON "bookmark" ("user_id", "created_at")'
+    )
+
+
+async def _add_user_stats_tables(conn: BaseDBAsyncClient) -> None:
+    # 기존 게시글로 통계를 채워두고, 이후로는 게시글 핸들러가 증분으로 갱신
+    await _create_tables(conn, UserStats, UserDayCount, UserMonthCount)
+    await rebuild_stats(conn)
+
+
+async def _add_post_search_index(conn: BaseDBAsyncClient) -> None:
+    # FTS5 가상 테이블은 generate_schemas 가 만들지 않으므로 여기서 만들고 기존 게시글을 색인
+    await rebuild_index(conn)
+
+
+async def _add_quote_search(conn: BaseDBAsyncClient) -> None:
+    # FTS5 테이블과 트리거는 generate_schemas 가 만들지 않으므로 여기서 만들고 기존 명언으로 채움
+    await _create_tables(conn, QuoteAuthor)
+    await conn.execute_query('CREATE INDEX IF NOT EXISTS "idx_quote_author_id" ON "quote" ("author", "id")')
+    await rebuild_search(conn)
+
+
+async def _index_post_search_author(conn: BaseDBAsyncClient) -> None:
+    # FTS5 는 컬럼 옵션을 바꿀 수 없으므로 author_id 를 색인 컬럼으로 바꾼 post_fts 를 새로 만들고 다시 색인
+    await conn.execute_query('DROP TABLE IF EXISTS "post_fts"')
+    await rebuild_index(conn)
+
+
+# (버전, 설명, 적용 함수) - 한번 배포된 항목은 수정하지 말고 새 버전을 뒤에 추가
+MIGRATIONS: List[Migration] = [
+    (1, "post (author_id, date) index, bookmark (user_id, quote_id) unique index", _add_post_and_bookmark_indexes),
+    (2, "content-addressed image blob table", _add_image_blob_table),
+    (3, "question (message) unique index", _add_question_message_unique_index),
+    (4, "bookmark (user_id, created_at) index", _add_bookmark_created_index),
+    (5, "per-user writing stats tables", _add_user_stats_tables),
+    (6, "post full-text search index (FTS5)", _add_post_search_index),
+    (7, "quote full-text search index, author counts, quote (author, id) index", _add_quote_search),
+    (8, "post full-text search: index author_id and filter by it in MATCH", _index_post_search_author),
+]
+
+
+async def _current_version(conn: BaseDBAsyncClient) -> int:
+    await conn.execute_query(
+        f'CREATE TABLE IF NOT EXISTS "{VERSION_TABLE}" ('
+        '"version" INT NOT NULL PRIMARY KEY, "name" TEXT NOT NULL, "applied_at" TEXT NOT NULL)'
+    )
+    rows = await conn.execute_query_dict(f'SELECT MAX("version") AS "version" FROM "{VERSION_TABLE}"')
+    return rows[0]["version"] or 0
+
+
+async def pending_migrations(connection_name: str = "default") -> List[Migration]:
+    """아직 적용되지 않은 마이그레이션 목록. 버전 테이블을 만들지 않으므로 읽기만 한다."""
+    conn = Tortoise.get_connection(connection_name)
+    tables = await conn.execute_query_dict(
+        'SELECT "name" FROM "sqlite_master" WHERE "type" = \'table\' AND "name" = ?', [VERSION_TABLE]
+    )
+    current = 0
+    if tables:
+        rows = await conn.execute_query_dict(f'SELECT MAX("version") AS "version" FROM "{VERSION_TABLE}"')
+        current = rows[0]["version"] or 0
+    return [migration for migration in sorted(MIGRATIONS) if migration[0] > current]
+
+
+async def check_schema(connection_name: str = "default") -> None:
+    pending = await pending_migrations(connection_name)
+    if pending:
+        versions = ", ".join(str(version) for version, _, _ in pending)
+        raise RuntimeError(
+            f"Database schema is {len(pending)} migration(s) behind (pending versions: {versions}). "
+            "Run `python -m src.tools.migrate` before starting the server."
+        )
+
+
+async def run_migrations(connection_name: str = "default") -> List[int]:
+    """아직 적용되지 않은 마이그레이션을 버전 순서대로 각각 하나의 트랜잭션에서 적용하고, 적용한 버전 목록을 반환한다."""
+    conn = Tortoise.get_connection(connection_name)
+    current = await _current_version(conn)
+    applied: List[int] = []
+    for version, name, apply in sorted(MIGRATIONS):
+        if version <= current:
+            continue
+        async with in_transaction(connection_name) as tx:
+            await apply(tx)
+            await tx.execute_query(
+                f'INSERT INTO "{VERSION_TABLE}" ("version", "name", "applied_at") VALUES (?, ?, ?)',
+                [version, name, datetime.now(timezone.utc).isoformat()],
+            )
+        applied.append(version)
+    return applied
+
+
+async def _has_tables(conn: BaseDBAsyncClient) -> bool:
+    rows = await conn.execute_query_dict('SELECT 1 FROM "sqlite_master" WHERE "type" = \'table\' LIMIT 1')
+    return bool(rows)
+
+
+async def migrate(connection_name: str = "default") -> List[int]:
+    """
+    빈 DB 는 모델 정의로 테이블을 모두 만든 뒤 마이그레이션을 적용하고, 기존 DB 는 마이그레이션 (중복 정리 후 인덱스 생성) 을
+    먼저 적용한 뒤 빠진 테이블만 만든다. 기존 DB 에 generate_schemas 를 먼저 돌리면 모델에 선언된 UNIQUE INDEX 가
+    중복 행 때문에 실패한다.
+    """
+    if not await _has_tables(Tortoise.get_connection(connection_name)):
+        await Tortoise.generate_schemas(safe=True)
+        return await run_migrations(connection_name)
+    applied = await run_migrations(connection_name)
+    await Tortoise.generate_schemas(safe=True)
+    return applied
+
+
+async def _main(status_only: bool) -> None:
+    from config import database_url
+    from src.tools.database import tortoise_config
+
+    await Tortoise.init(config=tortoise_config(database_url, MODELS))
+    try:
+        if status_only:
+            pending = await pending_migrations()
+            for version, name, _ in pending:
+                print(f"pending  {version}: {name}")
+            print(f"{len(pending)} pending migration(s)")
+            return
+        applied = await migrate()
+        print(f"Applied migrations: {applied}" if applied else "Schema is up to date")
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DB 스키마 생성 및 마이그레이션")
+    parser.add_argument("--status", action="store_true", help="적용하지 않고 남은 마이그레이션만 출력")
+    args = parser.parse_args()
+    asyncio.run(_main(args.status))
@@ -0,0 +1,104 @@
+"""
+일기 전문 검색. SQLite FTS5 가상 테이블 post_fts (rowid = post.id) 에 제목/본문을 색인하고,
+게시글 작성/수정/삭제 핸들러가 같은 트랜잭션 안에서 index_post / unindex_post 로 동기화한다.
+색인이 어긋났거나 처음 만들 때는 배치 단위로 다시 만든다.
+
+    python -m src.tools.post_search
+"""
+import argparse
+import asyncio
+from typing import List
+
+from tortoise import Tortoise
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.transactions import in_transaction
+
+from src.model.posts import Post
+from src.tools.database import MODELS, WRITE_CONNECTION, execute_statements, read_connection, tortoise_config
+from src.tools.fts import MARK_END, MARK_START
+
+FTS_TABLE = "post_fts"
+# 검색어는 fts.match_query 로 접두어 검색식으로 바꿔서 씀. trigram 은 두 글자 단어를 못 찾아서 사용하지 않음
+# author_id 도 색인해서 MATCH 안에서 작성자로 거름 (UNINDEXED 면 전체 사용자의 일치 결과를 다 훑은 뒤에 거르게 됨)
+CREATE_FTS_TABLE = (
+    f'CREATE VIRTUAL TABLE IF NOT EXISTS "{FTS_TABLE}" USING fts5('
+    '"title", "content", "author_id", tokenize = \'unicode61 remove_diacritics 2\')'
+)
+
+SNIPPET_TOKENS = 24
+
+
+async def index_post(conn: BaseDBAsyncClient, post: Post) -> None:
+    await conn.execute_query(
+        f'INSERT OR REPLACE INTO "{FTS_TABLE}" ("rowid", "title", "content", "author_id") VALUES (?, ?, ?, ?)',
+        [post.id, post.title, post.content, post.author_id],
+    )
+
+
+async def unindex_post(conn: BaseDBAsyncClient, post_id: int) -> None:
+    await conn.execute_query(f'DELETE FROM "{FTS_TABLE}" WHERE "rowid" = ?', [post_id])
+
+
+def _author_match(author_id: int, match: str) -> str:
+    # 검색어는 제목/본문에서만 찾도록 컬럼을 지정해서 작성자 번호와 같은 숫자 검색어가 author_id 에 걸리지 않게 함
+    return f'"author_id" : "{int(author_id)}" AND {{"title" "content"}} : ({match})'
+
+
+async def search_posts(author_id: int, match: str, limit: int, offset: int) -> List[dict]:
+    """author_id 의 게시글 중 match 에 맞는 것을 bm25 순(제목 가중치 2배)으로 반환한다."""
+    conn = read_connection(Post)
+    return await conn.execute_query_dict(
+        f'SELECT "post"."id", "post"."title", "post"."date", '
+        f'highlight("{FTS_TABLE}", 0, ?, ?) AS "title_highlight", '
+        f'snippet("{FTS_TABLE}", 1, ?, ?, \'…\', {SNIPPET_TOKENS}) AS "snippet" '
+        f'FROM "{FTS_TABLE}" JOIN "post" ON "post"."id" = "{FTS_TABLE}"."rowid" '
+        f'WHERE "{FTS_TABLE}" MATCH ? AND "post"."author_id" = ? '
+        f'ORDER BY bm25("{FTS_TABLE}", 2.0, 1.0, 0.0), "post"."id" LIMIT ? OFFSET ?',
+        [MARK_START, MARK_END, MARK_START, MARK_END, _author_match(author_id, match), author_id, limit, offset],
+    )
+
+
+async def rebuild_index(conn: BaseDBAsyncClient, batch_size: int = 1000) -> int:
+    """post 테이블 전체를 id 순으로 batch_size 개씩 읽어 색인을 다시 만든다. 색인한 게시글 수를 반환."""
+    await execute_statements(conn, CREATE_FTS_TABLE)
+    await conn.execute_query(f'DELETE FROM "{FTS_TABLE}"')
+    indexed = 0
+    last_id = 0
+    while True:
+        rows = await (
+            Post.filter(id__gt=last_id)
+            .using_db(conn)
+            .order_by("id")
+            .limit(batch_size)
+            .values_list("id", "title", "content", "author_id")
+        )
+        if not rows:
+            break
+        await conn.execute_many(
+            f'INSERT INTO "{FTS_TABLE}" ("rowid", "title", "content", "author_id") VALUES (?, ?, ?, ?)',
+            [list(row) for row in rows],
+        )
+        indexed += len(rows)
+        last_id = rows[-1][0]
+    # 여러 배치로 쌓인 세그먼트를 하나로 합쳐서 검색 속도를 유지
+    await conn.execute_query(f'INSERT INTO "{FTS_TABLE}" ("{FTS_TABLE}") VALUES (\'optimize\')')
+    return indexed
+
+
+async def _rebuild(batch_size: int) -> None:
+    from config import database_url
+    from src.tools.migrate import migrate
+
+    await Tortoise.init(config=tortoise_config(database_url, MODELS))
+    await migrate()
+    async with in_transaction(WRITE_CONNECTION) as conn:
+        count = await rebuild_index(conn, batch_size)
+    print(f"Indexed {count} posts into {FTS_TABLE}")
+    await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="일기 전문 검색 색인 다시 만들기")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(_rebuild(args.batch_size))
@@ -0,0 +1,56 @@
+"""
+정적 파일 옆에 미리 압축한 .gz / .br 파일을 만드는 빌드 스크립트.
+static 라우터가 Accept-Encoding 을 보고 골라서 내려준다.
+
+    python -m src.tools.precompress
+
+brotli 패키지가 설치되어 있을 때만 .br 도 만든다.
+"""
+import gzip
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.router.static import STATIC_ROOT
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_SUFFIXES = {".html", ".css", ".js", ".svg", ".json", ".txt", ".map"}
+
+
+def _write_if_smaller(target: Path, original_size: int, data: bytes) -> bool:
+    if len(data) >= original_size:
+        # 압축해도 작아지지 않으면 남아있던 예전 파일까지 지워서 원본을 내려주게 함
+        target.unlink(missing_ok=True)
+        return False
+    target.write_bytes(data)
+    return True
+
+
+def precompress(root: Path = STATIC_ROOT) -> int:
+    written = 0
+    for path in sorted(root.rglob("*")):
+        if not path.is_file() or path.suffix not in COMPRESSIBLE_SUFFIXES:
+            continue
+        raw = path.read_bytes()
+        # mtime=0 으로 고정해서 같은 내용이면 같은 .gz 가 나오도록 함
+        written += _write_if_smaller(
+            path.with_name(path.name + ".gz"), len(raw), gzip.compress(raw, compresslevel=9, mtime=0)
+        )
+        if brotli is not None:
+            written += _write_if_smaller(
+                path.with_name(path.name + ".br"), len(raw), brotli.compress(raw, quality=11)
+            )
+    return written
+
+
+if __name__ == "__main__":
+    count = precompress()
+    print(f"{count} precompressed files written under {STATIC_ROOT}")
+    if brotli is None:
+        print("brotli is not installed; only .gz files were generated")
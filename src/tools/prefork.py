@@ -0,0 +1,344 @@
+"""
+여러 워커 프로세스로 서비스하는 prefork 서버.
+마스터가 앱 import, 정적 매니페스트, 명언/질문 id 풀처럼 읽기만 하는 데이터를 먼저 만들고 소켓을 연 뒤 워커를 fork 한다.
+워커들은 그 메모리를 copy-on-write 로 공유하고, 같은 소켓에서 커널이 나눠주는 연결을 받는다.
+
+    python main.py                 # WEB_WORKERS 개 워커
+    kill -HUP <마스터 pid>          # 공유 데이터를 다시 만들고 워커를 하나씩 교체 (무중단)
+    kill -TERM <마스터 pid>         # 처리 중인 요청을 마치고 종료 (한 번 더 보내면 바로 종료)
+
+워커는 마스터가 불러온 코드를 그대로 물려받으므로, 코드가 바뀐 배포는 마스터째로 다시 띄워야 한다.
+"""
+import asyncio
+import contextlib
+import ctypes
+import gc
+import logging
+import os
+import select
+import shutil
+import signal
+import tempfile
+import time
+from multiprocessing.sharedctypes import RawArray
+from typing import Callable, Dict, List, Optional, Tuple
+
+import uvicorn
+
+from config import worker_graceful_timeout, worker_timeout
+
+# 마스터는 uvicorn 의 로그 설정을 그대로 써서 워커 로그와 같은 형식으로 남긴다
+logger = logging.getLogger("uvicorn.error")
+
+# 한 번에 여러 번 실패하는 워커를 계속 띄우지 않도록 다음 fork 까지 기다리는 시간
+RESPAWN_BACKOFF = 1.0
+# 워커가 graceful 종료 시간 안에 끝나지 않았을 때 SIGKILL 까지 더 기다리는 시간
+KILL_GRACE = 5.0
+
+
+class _WorkerSlot(ctypes.Structure):
+    _fields_ = [
+        ("pid", ctypes.c_int),
+        ("generation", ctypes.c_int),
+        ("started_at", ctypes.c_double),
+        ("ready_at", ctypes.c_double),
+        ("heartbeat_at", ctypes.c_double),
+    ]
+
+
+# 워커 프로세스 안에서만 설정됨: 마스터와 공유하는 상태 테이블과 그 중 자기 칸
+_table = None
+_slot: Optional[int] = None
+# 마스터가 fork 전에 만드는 임시 디렉토리. 워커끼리 파일로 주고받을 것 (지표 등) 을 둔다
+_shared_dir: Optional[str] = None
+
+
+def is_worker() -> bool:
+    return _slot is not None
+
+
+def shared_dir() -> Optional[str]:
+    return _shared_dir
+
+
+def live_pids() -> List[int]:
+    if _table is None:
+        return [os.getpid()]
+    return [slot.pid for slot in _table if slot.pid > 0]
+
+
+def mark_ready() -> None:
+    if _slot is not None:
+        now = time.time()
+        _table[_slot].ready_at = now
+        _table[_slot].heartbeat_at = now
+
+
+async def heartbeat() -> None:
+    """이벤트 루프가 돌고 있다는 표시. 루프가 막혀서 worker_timeout 동안 못 남기면 마스터가 워커를 교체한다."""
+    interval = max(worker_timeout / 4, 1.0)
+    while True:
+        _table[_slot].heartbeat_at = time.time()
+        await asyncio.sleep(interval)
+
+
+def _slot_stats(index: int, slot: _WorkerSlot, now: float) -> dict:
+    return {
+        "index": index,
+        "pid": slot.pid,
+        "generation": slot.generation,
+        "uptime_s": round(now - slot.started_at, 1),
+        "ready": slot.ready_at > 0,
+        "heartbeat_age_s": round(now - slot.heartbeat_at, 1) if slot.heartbeat_at else None,
+    }
+
+
+def worker_stats() -> dict:
+    """/health 용: 이 프로세스와, prefork 면 같은 마스터 아래 모든 워커의 상태."""
+    if _slot is None:
+        return {"mode": "single", "pid": os.getpid()}
+    now = time.time()
+    return {
+        "mode": "prefork",
+        "pid": os.getpid(),
+        "index": _slot,
+        "generation": _table[_slot].generation,
+        "workers": [_slot_stats(index, slot, now) for index, slot in enumerate(_table) if slot.pid > 0],
+    }
+
+
+class PreforkServer:
+    def __init__(self, config: uvicorn.Config, workers: int, preload: Callable[[], None]):
+        self.config = config
+        self.workers = max(workers, 1)
+        self.preload = preload
+        # 교체 중에는 기존 워커와 새 워커가 잠깐 같이 떠 있으므로 두 배로 잡음
+        self.table = RawArray(_WorkerSlot, self.workers * 2)
+        self.generation = 0
+        self.children: Dict[int, int] = {}  # pid -> 테이블 칸
+        self.retiring: Dict[int, float] = {}  # 종료 신호를 보낸 pid -> SIGKILL 할 시각
+        self.restart_queue: List[int] = []  # 교체할 기존 워커 pid
+        self.replacing: Optional[Tuple[int, int]] = None  # (준비를 기다리는 새 워커, 그 다음 내릴 기존 워커)
+        self.pending_signals: List[int] = []
+        self.stopping = False
+        self.respawn_after = 0.0
+        self.slots_full = False
+        self.sockets = []
+
+    # --- 워커 ---
+
+    def _run_worker(self, slot: int) -> None:
+        global _table, _slot
+        status = 1
+        try:
+            _table, _slot = self.table, slot
+            signal.set_wakeup_fd(-1)
+            # 종료는 마스터가 SIGTERM 으로 알려줌. uvicorn 이 SIGINT/SIGTERM 핸들러를 직접 건다
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.SIG_IGN)
+            gc.enable()
+            server = uvicorn.Server(self.config)
+            server.run(sockets=self.sockets)
+            status = 0 if server.started else 3
+        except BaseException:
+            logger.exception("Worker [%d] crashed", os.getpid())
+        finally:
+            os._exit(status)
+
+    def _spawn(self) -> Optional[int]:
+        # 종료가 늦는 워커들이 칸을 잡고 있으면 빈 칸이 없을 수 있음. 그때는 건너뛰고 다음 루프에서 다시 시도
+        slot = next((index for index, entry in enumerate(self.table) if entry.pid == 0), None)
+        if slot is None:
+            if not self.slots_full:
+                logger.warning("No free worker slot (%d in use); waiting for exiting workers", len(self.table))
+            self.slots_full = True
+            return None
+        self.slots_full = False
+        entry = self.table[slot]
+        entry.generation = self.generation
+        entry.started_at = time.time()
+        entry.ready_at = 0.0
+        entry.heartbeat_at = 0.0
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker(slot)
+        entry.pid = pid
+        self.children[pid] = slot
+        logger.info("Booted worker [%d] (slot %d, generation %d)", pid, slot, self.generation)
+        return pid
+
+    def _retire(self, pid: int, sig: int = signal.SIGTERM) -> None:
+        if pid not in self.children or (pid in self.retiring and sig == signal.SIGTERM):
+            return
+        with contextlib.suppress(ProcessLookupError):
+            os.kill(pid, sig)
+        # SIGKILL 을 보낸 워커는 다시 죽일 필요 없이 회수만 기다림
+        self.retiring[pid] = time.time() + worker_graceful_timeout + KILL_GRACE if sig == signal.SIGTERM else float("inf")
+
+    def _active(self) -> int:
+        return len(self.children) - len(self.retiring)
+
+    # --- 마스터 루프 ---
+
+    def _on_signal(self, sig: int, frame) -> None:
+        self.pending_signals.append(sig)
+
+    def _handle_signals(self) -> None:
+        while self.pending_signals:
+            sig = self.pending_signals.pop(0)
+            if sig in (signal.SIGINT, signal.SIGTERM):
+                self._stop(force=self.stopping)
+            elif sig == signal.SIGHUP and not self.stopping:
+                self._start_restart()
+
+    def _stop(self, force: bool) -> None:
+        if not self.stopping:
+            logger.info("Shutting down %d workers", len(self.children))
+        self.stopping = True
+        self.restart_queue.clear()
+        self.replacing = None
+        for pid in list(self.children):
+            self._retire(pid, signal.SIGKILL if force else signal.SIGTERM)
+
+    def _start_restart(self) -> None:
+        if self.restart_queue or self.replacing:
+            logger.info("Rolling restart already in progress")
+            return
+        try:
+            gc.unfreeze()
+            self.preload()
+        except Exception:
+            logger.exception("Reloading shared data failed; keeping current workers")
+            return
+        finally:
+            gc.freeze()
+        self.generation += 1
+        self.restart_queue = [pid for pid in self.children if pid not in self.retiring]
+        logger.info("Rolling restart to generation %d (%d workers)", self.generation, len(self.restart_queue))
+
+    def _advance_restart(self) -> None:
+        if self.replacing is not None:
+            new_pid, old_pid = self.replacing
+            if self.table[self.children[new_pid]].ready_at:
+                self._retire(old_pid)
+                self.replacing = None
+            return
+        while self.restart_queue:
+            old_pid = self.restart_queue[0]
+            if old_pid in self.children and old_pid not in self.retiring:
+                new_pid = self._spawn()
+                if new_pid is None:
+                    return
+                self.restart_queue.pop(0)
+                self.replacing = (new_pid, old_pid)
+                return
+            self.restart_queue.pop(0)
+
+    def _reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            slot = self.children.pop(pid, None)
+            expected = self.retiring.pop(pid, None) is not None
+            if slot is None:
+                continue
+            ready = self.table[slot].ready_at > 0
+            self.table[slot].pid = 0
+            code = os.waitstatus_to_exitcode(status)
+            if self.replacing is not None and self.replacing[0] == pid:
+                # 새 워커가 준비되기 전에 죽으면 교체를 멈추고 기존 워커를 유지
+                logger.error("Rolling restart aborted; keeping remaining workers")
+                self.replacing = None
+                self.restart_queue.clear()
+            if expected or self.stopping:
+                logger.info("Worker [%d] exited (%d)", pid, code)
+                continue
+            logger.error("Worker [%d] exited unexpectedly (%d)", pid, code)
+            if not ready:
+                self.respawn_after = time.monotonic() + RESPAWN_BACKOFF
+
+    def _check_workers(self) -> None:
+        now = time.time()
+        for pid, slot in list(self.children.items()):
+            if pid in self.retiring:
+                continue
+            entry = self.table[slot]
+            last = entry.heartbeat_at if entry.ready_at else entry.started_at
+            if now - last > worker_timeout:
+                logger.error(
+                    "Worker [%d] %s for %ds; killing",
+                    pid, "missed heartbeats" if entry.ready_at else "not ready", worker_timeout,
+                )
+                self._retire(pid, signal.SIGKILL)
+
+    def _kill_overdue(self) -> None:
+        now = time.time()
+        for pid, deadline in list(self.retiring.items()):
+            if now > deadline:
+                logger.warning("Worker [%d] did not exit in time; killing", pid)
+                with contextlib.suppress(ProcessLookupError):
+                    os.kill(pid, signal.SIGKILL)
+                self.retiring[pid] = float("inf")
+
+    def _maintain(self) -> None:
+        while self._active() < self.workers and time.monotonic() >= self.respawn_after:
+            if self._spawn() is None:
+                return
+
+    def run(self) -> None:
+        global _shared_dir
+        # fork 전에 만든 객체를 gc 가 건드리지 않게 해서 (refcount 외의 헤더 쓰기) 공유 페이지가 복사되지 않도록 함
+        gc.disable()
+        self.config.load()
+        self.preload()
+        self.sockets = [self.config.bind_socket()]
+        _shared_dir = tempfile.mkdtemp(prefix="prefork-")
+        gc.freeze()
+
+        wakeup_read, wakeup_write = os.pipe()
+        os.set_blocking(wakeup_read, False)
+        os.set_blocking(wakeup_write, False)
+        signal.set_wakeup_fd(wakeup_write)
+        for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP, signal.SIGCHLD):
+            signal.signal(sig, self._on_signal)
+
+        logger.info("Prefork master [%d] starting %d workers", os.getpid(), self.workers)
+        try:
+            self._maintain()
+            while self.children or not self.stopping:
+                select.select([wakeup_read], [], [], 1.0)
+                with contextlib.suppress(BlockingIOError):
+                    while os.read(wakeup_read, 4096):
+                        pass
+                self._handle_signals()
+                self._reap()
+                self._kill_overdue()
+                if self.stopping:
+                    continue
+                self._check_workers()
+                self._advance_restart()
+                self._maintain()
+        finally:
+            signal.set_wakeup_fd(-1)
+            os.close(wakeup_read)
+            os.close(wakeup_write)
+            for sock in self.sockets:
+                sock.close()
+            shutil.rmtree(_shared_dir, ignore_errors=True)
+        logger.info("Prefork master [%d] stopped", os.getpid())
+
+
+def serve(app, preload: Callable[[], None], workers: int, host: str, port: int) -> None:
+    """preload 로 공유 데이터를 만든 뒤 workers 개 워커를 fork 해서 app 을 서비스한다."""
+    config = uvicorn.Config(app, host=host, port=port, timeout_graceful_shutdown=worker_graceful_timeout)
+    if not hasattr(os, "fork"):
+        logger.warning("fork is not available; serving with a single process")
+        uvicorn.Server(config).run()
+        return
+    PreforkServer(config, workers, preload).run()
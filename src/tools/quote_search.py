@@ -0,0 +1,101 @@
+"""
+명언 검색. 외부 콘텐츠 FTS5 테이블 quote_fts (rowid = quote.id) 와 저자별 명언 수 테이블 quoteauthor 를
+quote 테이블의 트리거로 동기화한다. 스크래퍼/임포터가 bulk insert 해도 같이 갱신되므로 따로 부를 필요가 없다.
+어긋났을 때는 다시 만든다.
+
+    python -m src.tools.quote_search
+"""
+import asyncio
+from typing import List, Optional
+
+from tortoise import Tortoise
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.transactions import in_transaction
+
+from src.model.quotes import Quote
+from src.tools.database import MODELS, WRITE_CONNECTION, execute_statements, read_connection, tortoise_config
+
+FTS_TABLE = "quote_fts"
+AUTHOR_TABLE = "quoteauthor"
+
+CREATE_SEARCH_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS "{FTS_TABLE}" USING fts5(
+    "message", "author", content = 'quote', content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS "quote_search_ai" AFTER INSERT ON "quote" BEGIN
+    INSERT INTO "{FTS_TABLE}" ("rowid", "message", "author") VALUES (new."id", new."message", new."author");
+    INSERT INTO "{AUTHOR_TABLE}" ("author", "quote_count") VALUES (new."author", 1)
+        ON CONFLICT ("author") DO UPDATE SET "quote_count" = "quote_count" + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS "quote_search_ad" AFTER DELETE ON "quote" BEGIN
+    INSERT INTO "{FTS_TABLE}" ("{FTS_TABLE}", "rowid", "message", "author") VALUES ('delete', old."id", old."message", old."author");
+    UPDATE "{AUTHOR_TABLE}" SET "quote_count" = "quote_count" - 1 WHERE "author" = old."author";
+    DELETE FROM "{AUTHOR_TABLE}" WHERE "author" = old."author" AND "quote_count" <= 0;
+END;
+CREATE TRIGGER IF NOT EXISTS "quote_search_au" AFTER UPDATE OF "message", "author" ON "quote" BEGIN
+    INSERT INTO "{FTS_TABLE}" ("{FTS_TABLE}", "rowid", "message", "author") VALUES ('delete', old."id", old."message", old."author");
+    INSERT INTO "{FTS_TABLE}" ("rowid", "message", "author") VALUES (new."id", new."message", new."author");
+    UPDATE "{AUTHOR_TABLE}" SET "quote_count" = "quote_count" - 1 WHERE "author" = old."author";
+    DELETE FROM "{AUTHOR_TABLE}" WHERE "author" = old."author" AND "quote_count" <= 0;
+    INSERT INTO "{AUTHOR_TABLE}" ("author", "quote_count") VALUES (new."author", 1)
+        ON CONFLICT ("author") DO UPDATE SET "quote_count" = "quote_count" + 1;
+END;
+"""
+
+
+async def search_quotes(
+    match: str,
+    author: Optional[str],
+    after: Optional[tuple],
+    limit: int,
+) -> List[dict]:
+    """
+    match 에 맞는 명언을 bm25 점수순(본문 가중치 2배)으로 limit 개 반환한다.
+    after 는 이전 페이지 마지막 (score, id) 로, 그 다음부터 이어서 읽는다.
+    """
+    sql = (
+        f'SELECT "quote"."id", "quote"."author", "quote"."message", bm25("{FTS_TABLE}", 2.0, 1.0) AS "score" '
+        f'FROM "{FTS_TABLE}" JOIN "quote" ON "quote"."id" = "{FTS_TABLE}"."rowid" '
+        f'WHERE "{FTS_TABLE}" MATCH ?'
+    )
+    values: list = [match]
+    if author is not None:
+        sql += ' AND "quote"."author" = ?'
+        values.append(author)
+    if after is not None:
+        # (score, id) > (last_score, last_id)
+        sql += f' AND (bm25("{FTS_TABLE}", 2.0, 1.0) > ? OR (bm25("{FTS_TABLE}", 2.0, 1.0) = ? AND "quote"."id" > ?))'
+        values.extend([after[0], after[0], after[1]])
+    sql += ' ORDER BY "score", "quote"."id" LIMIT ?'
+    values.append(limit)
+    return await read_connection(Quote).execute_query_dict(sql, values)
+
+
+async def rebuild_search(conn: BaseDBAsyncClient) -> int:
+    """FTS 색인과 저자별 명언 수를 quote 테이블에서 다시 만든다. 저자 수를 반환."""
+    await execute_statements(conn, CREATE_SEARCH_SCHEMA)
+    await conn.execute_query(f'INSERT INTO "{FTS_TABLE}" ("{FTS_TABLE}") VALUES (\'rebuild\')')
+    await conn.execute_query(f'DELETE FROM "{AUTHOR_TABLE}"')
+    await conn.execute_query(
+        f'INSERT INTO "{AUTHOR_TABLE}" ("author", "quote_count") '
+        f'SELECT "author", COUNT(*) FROM "quote" GROUP BY "author"'
+    )
+    rows = await conn.execute_query_dict(f'SELECT COUNT(*) AS "authors" FROM "{AUTHOR_TABLE}"')
+    return rows[0]["authors"]
+
+
+async def _rebuild() -> None:
+    from config import database_url
+    from src.tools.migrate import migrate
+
+    await Tortoise.init(config=tortoise_config(database_url, MODELS))
+    await migrate()
+    async with in_transaction(WRITE_CONNECTION) as conn:
+        count = await rebuild_search(conn)
+    print(f"Rebuilt quote search index ({count} authors)")
+    await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(_rebuild())
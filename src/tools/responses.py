@@ -0,0 +1,16 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    이미 JSON 으로 바로 쓸 수 있는 dict/list (ORM .values() 결과 등) 를 orjson 으로 한 번에 인코딩하는 응답.
+    핸들러가 이 응답을 직접 반환하면 FastAPI 의 response_model 검증/변환을 건너뛰므로,
+    response_model 은 OpenAPI 문서용으로만 쓰이고 내용은 그 스키마와 같은 모양이어야 한다.
+    """
+
+    def render(self, content: Any) -> bytes:
+        # datetime 은 pydantic 과 같은 형식 (UTC 는 "Z") 으로 맞춤
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,15 @@
+from pypika_tortoise.terms import AggregateFunction
+from tortoise.functions import Aggregate
+
+
+class _GroupConcat(AggregateFunction):
+    def __init__(self, term, alias=None):
+        super().__init__("GROUP_CONCAT", term, alias=alias)
+
+
+class GroupConcat(Aggregate):
+    """
+    GROUP_CONCAT(expr) 집계 (SQLite/MySQL). 결과는 쉼표로 이어진 문자열.
+    """
+
+    database_func = _GroupConcat
@@ -0,0 +1,182 @@
+"""
+서버 시작 시간 측정. main.py 가 import 가 끝난 시점과 lifespan 단계마다 mark 를 남기고,
+첫 요청의 응답이 끝난 시점까지 기록해서 /health 의 startup 항목으로 보여준다.
+import 시간을 모듈별로 보거나, 실제로 서버를 띄워서 첫 응답까지 걸린 시간을 재려면
+
+    python -m src.tools.startup            # python -X importtime 결과를 패키지별로 합산
+    python -m src.tools.startup --serve    # uvicorn 을 띄워서 /health 첫 응답까지 걸린 시간
+"""
+import argparse
+import logging
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    """main 모듈을 불러오기 시작한 시점부터 단계별 소요 시간 (ms) 을 기록한다."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.phases: Dict[str, float] = {}
+        self.ready_ms: Optional[float] = None
+        self.first_request_ms: Optional[float] = None
+
+    def _elapsed_ms(self, since: float) -> float:
+        return round((time.perf_counter() - since) * 1000, 1)
+
+    def mark(self, phase: str) -> None:
+        """직전 mark 부터 지금까지를 phase 에 걸린 시간으로 기록."""
+        self.phases[phase] = self._elapsed_ms(self._last)
+        self._last = time.perf_counter()
+
+    def forked(self) -> None:
+        """prefork 워커: 마스터에서 잰 단계는 그대로 두고, 준비/첫 요청 시간은 fork 시점부터 다시 잰다."""
+        self.started = self._last = time.perf_counter()
+        self.ready_ms = self.first_request_ms = None
+
+    def mark_ready(self) -> None:
+        self.ready_ms = self._elapsed_ms(self.started)
+
+    def mark_first_request(self) -> None:
+        self.first_request_ms = self._elapsed_ms(self.started)
+        logger.info(
+            "Startup: %s, ready %.1fms, first request served %.1fms",
+            ", ".join(f"{phase} {ms:.1f}ms" for phase, ms in self.phases.items()),
+            self.ready_ms or 0.0,
+            self.first_request_ms,
+        )
+
+    def stats(self) -> dict:
+        return {"phases_ms": dict(self.phases), "ready_ms": self.ready_ms, "first_request_ms": self.first_request_ms}
+
+
+class FirstRequestTimer:
+    """첫 HTTP 응답이 끝까지 전송된 시점을 기록하는 ASGI 미들웨어. 기록한 뒤에는 그대로 통과시킨다."""
+
+    def __init__(self, app, report: StartupReport):
+        self.app = app
+        self.report = report
+
+    async def __call__(self, scope, receive, send):
+        if self.report.first_request_ms is not None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_and_record(message):
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                if self.report.first_request_ms is None:
+                    self.report.mark_first_request()
+
+        await self.app(scope, receive, send_and_record)
+
+
+startup_report = StartupReport()
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[int, int, str]]:
+    """`-X importtime` 출력에서 (self us, cumulative us, 들여쓰기 포함 모듈 이름)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def import_breakdown(module: str = "main") -> Tuple[int, Dict[str, int], Dict[str, int]]:
+    """
+    새 인터프리터에서 module 을 import 하고 (총 us, 최상위 패키지별 us, 프로젝트 모듈별 self us) 를 반환.
+    패키지별 값은 module 이 직접 처음 불러온 import 들의 cumulative 합이라 서로 겹치지 않는다.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"import {module} failed")
+    rows = _parse_importtime(result.stderr)
+    total = 0
+    packages: Dict[str, int] = defaultdict(int)
+    project: Dict[str, int] = {}
+    children: List[Tuple[str, int]] = []
+    # 출력은 자식이 부모보다 먼저 나오므로, module 줄이 나올 때까지 바로 아래 단계 import 를 모아둠
+    for self_us, cumulative_us, name in rows:
+        stripped = name.strip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        if stripped.split(".")[0] in ("src", "config"):
+            project[stripped] = self_us
+        if depth == 1:
+            children.append((stripped, cumulative_us))
+        elif depth == 0:
+            if stripped == module:
+                total = cumulative_us
+                project[stripped] = self_us
+                for child, child_us in children:
+                    packages[child.split(".")[0]] += child_us
+            children = []
+    return total, dict(packages), project
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_request(timeout: float = 30.0) -> float:
+    """uvicorn 으로 main:app 을 띄우고 /health 가 처음 200 을 돌려줄 때까지의 시간 (ms)."""
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"server exited with code {server.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - started) * 1000
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        raise RuntimeError(f"no response from /health within {timeout:.0f}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="서버 시작 시간 측정")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--serve", action="store_true", help="uvicorn 을 띄워서 첫 응답까지 걸린 시간도 측정")
+    args = parser.parse_args()
+
+    total, packages, project = import_breakdown(args.module)
+    print(f"import {args.module}: {total / 1000:.1f}ms")
+    print("\nby package (cumulative):")
+    for name, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {us / 1000:8.1f}ms  {name}")
+    print("\nproject modules (self):")
+    for name, us in sorted(project.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {us / 1000:8.1f}ms  {name}")
+
+    if args.serve:
+        print(f"\nprocess start -> first /health response: {time_to_first_request():.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import mimetypes
+import os
+import re
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 파일명에 내용 해시가 들어간 자산 (예: app.3f9c2a1b.js) 은 내용이 바뀌면 이름도 바뀌므로 오래 캐시
+FINGERPRINT_PATTERN = re.compile(r"\.[0-9a-f]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+# Accept-Encoding 에 따라 고를 미리 압축된 파일 (우선순위 순)
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+@dataclass(frozen=True)
+class FileVariant:
+    path: Path
+    stat_result: os.stat_result
+    etag: str
+    last_modified: str
+
+
+@dataclass(frozen=True)
+class StaticEntry:
+    original: FileVariant
+    media_type: str
+    cache_control: str
+    # content-encoding -> 미리 압축된 파일
+    encoded: Dict[str, FileVariant] = field(default_factory=dict)
+
+
+def _variant(path: Path, stat_result: os.stat_result, encoding: Optional[str] = None) -> FileVariant:
+    tag = f"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"
+    if encoding:
+        tag = f"{tag}-{encoding}"
+    return FileVariant(path, stat_result, f'"{tag}"', formatdate(stat_result.st_mtime, usegmt=True))
+
+
+def _build_entry(path: Path) -> StaticEntry:
+    stat_result = path.stat()
+    encoded = {}
+    for encoding, suffix in PRECOMPRESSED:
+        compressed = path.with_name(path.name + suffix)
+        try:
+            compressed_stat = compressed.stat()
+        except FileNotFoundError:
+            continue
+        # 원본보다 오래된 압축본은 빌드를 다시 안 돌린 것이므로 무시
+        if compressed_stat.st_mtime_ns >= stat_result.st_mtime_ns:
+            encoded[encoding] = _variant(compressed, compressed_stat, encoding)
+    return StaticEntry(
+        original=_variant(path, stat_result),
+        media_type=mimetypes.guess_type(path.name)[0] or "application/octet-stream",
+        cache_control=IMMUTABLE_CACHE if FINGERPRINT_PATTERN.search(path.name) else REVALIDATE_CACHE,
+        encoded=encoded,
+    )
+
+
+def _scan(directory: Path) -> Dict[str, StaticEntry]:
+    """directory 아래 파일들을 '상대경로(posix)' -> StaticEntry 로 모은다. 밖을 가리키는 심볼릭 링크는 제외."""
+    root = directory.resolve()
+    entries: Dict[str, StaticEntry] = {}
+    if not root.is_dir():
+        return entries
+    for path in root.rglob("*"):
+        if path.suffix in (".gz", ".br") or not path.is_file():
+            continue
+        resolved = path.resolve()
+        if not resolved.is_relative_to(root):
+            continue
+        entries[path.relative_to(root).as_posix()] = _build_entry(resolved)
+    return entries
+
+
+class StaticManifest:
+    """
+    src/static 트리를 시작할 때 한 번 훑어서 URL 경로 -> 파일 정보 로 들고 있는 매니페스트.
+    요청 처리 중에는 파일시스템을 건드리지 않고 dict 조회만 한다.
+    """
+
+    def __init__(self, html_dir: Path, asset_dir: Path, not_found_file: Path):
+        self.html_dir = html_dir
+        self.asset_dir = asset_dir
+        self.not_found_file = not_found_file
+        self.pages: Dict[str, StaticEntry] = {}
+        self.assets: Dict[str, StaticEntry] = {}
+        self.not_found: Optional[StaticEntry] = None
+        self.loaded = False
+
+    def build(self) -> None:
+        files = _scan(self.html_dir)
+        pages: Dict[str, StaticEntry] = dict(files)
+        # 확장자 없는 주소 (/about -> about.html), 디렉토리 주소 (/blog -> blog/index.html) 도 등록.
+        # 예전 파일시스템 탐색과 같은 우선순위: 디렉토리 index.html > 이름.html > 확장자 없는 파일
+        for relative, entry in files.items():
+            if relative.endswith(".html"):
+                pages[relative[: -len(".html")]] = entry
+        for relative, entry in files.items():
+            if relative == "index.html" or relative.endswith("/index.html"):
+                pages[relative[: -len("index.html")].rstrip("/")] = entry
+        assets = _scan(self.asset_dir)
+        not_found = _build_entry(self.not_found_file.resolve())
+
+        self.pages, self.assets, self.not_found = pages, assets, not_found
+        self.loaded = True
+
+    def ensure_loaded(self) -> None:
+        if not self.loaded:
+            self.build()
+
+    def page(self, url_path: str) -> Optional[StaticEntry]:
+        self.ensure_loaded()
+        return self.pages.get(url_path.strip("/"))
+
+    def asset(self, asset_path: str) -> Optional[StaticEntry]:
+        self.ensure_loaded()
+        return self.assets.get(asset_path.strip("/"))
+
+    async def watch(self, root: Path) -> None:
+        """개발 모드용: static 폴더가 바뀌면 매니페스트를 다시 만든다 (watchfiles 가 있을 때만)."""
+        try:
+            from watchfiles import awatch
+        except ImportError:
+            logger.warning("watchfiles is not installed; static manifest will not reload")
+            return
+        async for _ in awatch(root):
+            await asyncio.to_thread(self.build)
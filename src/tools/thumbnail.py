@@ -0,0 +1,111 @@
+import asyncio
+import contextlib
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config import image_workers
+
+logger = logging.getLogger(__name__)
+
+# 파생 이미지 이름표 -> 긴 변 최대 픽셀 (None 이면 원본 크기 그대로 WebP 변환)
+VARIANTS: Dict[str, Optional[int]] = {
+    "sm": 160,  # 달력
+    "md": 480,  # 주간 보기
+    "full": None,
+}
+# 요청한 크기가 아직 없으면 더 큰 파생본 -> 원본 순으로 대체
+_FALLBACKS: Dict[str, Tuple[str, ...]] = {
+    "sm": ("sm", "md", "full"),
+    "md": ("md", "full"),
+    "full": ("full",),
+}
+
+_pool: Optional[ProcessPoolExecutor] = None
+# 이미지 경로 -> 진행 중인 생성 작업 (같은 이미지를 여러 게시글에 올려도 한 번만 만듦)
+_pending: Dict[Path, asyncio.Task] = {}
+
+
+def variant_path(image_path: Path, label: str) -> Path:
+    return image_path.with_name(f"{image_path.stem}.{label}.webp")
+
+
+def _render_derivatives(source: str, targets: List[Tuple[str, Optional[int]]]) -> None:
+    # 프로세스 풀 워커에서 실행되므로 Pillow 는 여기서 import
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as original:
+        original = ImageOps.exif_transpose(original)
+        if original.mode not in ("RGB", "RGBA"):
+            original = original.convert("RGBA")
+        for target, max_side in targets:
+            image = original.copy()
+            if max_side is not None:
+                image.thumbnail((max_side, max_side))
+            # 같은 파일을 다른 프로세스(워커)가 동시에 만들 수 있으므로 임시 파일 이름은 작업마다 따로 잡음
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as temp_file:
+                    image.save(temp_file, format="WEBP", quality=80)
+                os.replace(temp_path, target)
+            except BaseException:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(temp_path)
+                raise
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=image_workers)
+    return _pool
+
+
+async def _generate(image_path: Path) -> None:
+    targets = [(str(variant_path(image_path, label)), max_side) for label, max_side in VARIANTS.items()]
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(_get_pool(), _render_derivatives, str(image_path), targets)
+    except Exception:
+        logger.exception("Failed to generate derivatives for %s", image_path)
+
+
+def schedule_derivatives(image_path: str) -> None:
+    """업로드 응답을 기다리게 하지 않고 백그라운드에서 썸네일/WebP 파생 이미지를 만든다."""
+    path = Path(image_path)
+    # 같은 내용의 이미지가 이미 올라와 있으면 파생 이미지도 이미 있음
+    if path in _pending or all(variant_path(path, label).exists() for label in VARIANTS):
+        return
+    task = asyncio.create_task(_generate(path))
+    _pending[path] = task
+    task.add_done_callback(lambda _: _pending.pop(path, None))
+
+
+def best_variant(image_path: Path, size: Optional[str]) -> Path:
+    if size is None:
+        return image_path
+    for label in _FALLBACKS[size]:
+        candidate = variant_path(image_path, label)
+        if candidate.exists():
+            return candidate
+    return image_path
+
+
+def remove_derivatives(image_path: Path) -> None:
+    for label in VARIANTS:
+        try:
+            variant_path(image_path, label).unlink()
+        except FileNotFoundError:
+            pass
+
+
+async def shutdown_derivative_pool() -> None:
+    global _pool
+    if _pending:
+        await asyncio.gather(*_pending.values(), return_exceptions=True)
+    if _pool is not None:
+        _pool.shutdown(wait=True)
+        _pool = None
@@ -0,0 +1,117 @@
+import time
+import typing
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+
+from tortoise.signals import post_delete, post_save
+
+from config import debug_mode, token_cache_size, token_cache_ttl, token_cache_worker_ttl, web_workers
+from src.model.users import User
+
+if typing.TYPE_CHECKING:
+    from src.tools.jwt import _TokenConfig
+
+
+@dataclass
+class _CacheEntry:
+    token_config: "_TokenConfig"
+    user_row: dict
+    expires_at: float
+
+
+class TokenCache:
+    """
+    검증이 끝난 access 토큰 -> (_TokenConfig, User 스냅샷) LRU/TTL 캐시.
+    엔트리는 토큰의 exp 를 넘겨서 살아있지 않고, User 가 저장/삭제되면 해당 유저 엔트리는 모두 지워진다.
+    시그널은 같은 프로세스의 Model.save/delete 에서만 오므로 queryset .update() 로 User 를 바꾸는 곳은
+    invalidate_user 를 직접 부르고, 다른 워커에서 바뀐 내용은 TTL 이 지나야 반영된다.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> Optional[_CacheEntry]:
+        entry = self._entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.time():
+            self._remove(token)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(token)
+        self.hits += 1
+        return entry
+
+    def put(self, token: str, token_config: "_TokenConfig", user: User, exp: int) -> None:
+        if self.maxsize <= 0:
+            return
+        expires_at = min(float(exp), time.time() + self.ttl)
+        # 모델 인스턴스 대신 컬럼 값만 들고 있다가 hit 때 다시 인스턴스로 만든다
+        user_row = {column: getattr(user, field) for field, column in User._meta.fields_db_projection.items()}
+        self._remove(token)
+        self._entries[token] = _CacheEntry(token_config, user_row, expires_at)
+        self._tokens_by_user.setdefault(user.id, set()).add(token)
+        while len(self._entries) > self.maxsize:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def invalidate_user(self, user_id: int) -> None:
+        for token in list(self._tokens_by_user.get(user_id, ())):
+            self._remove(token)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tokens_by_user.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _remove(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        user_id = entry.user_row["id"]
+        tokens = self._tokens_by_user.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[user_id]
+
+    @staticmethod
+    def build_user(entry: _CacheEntry) -> User:
+        # 요청마다 새 인스턴스를 만들어서 핸들러끼리 객체를 공유하지 않도록 함
+        return User._init_from_db(**entry.user_row)
+
+
+# prefork 워커끼리는 무효화가 전달되지 않으므로 워커가 여러 개면 TTL 을 짧게 잡아서 오래된 유저 정보가 남는 시간을 줄임
+token_cache = TokenCache(
+    maxsize=token_cache_size,
+    ttl=token_cache_ttl if debug_mode or web_workers <= 1 else min(token_cache_ttl, token_cache_worker_ttl),
+)
+
+
+@post_save(User)
+async def _invalidate_on_save(sender, instance, created, using_db, update_fields) -> None:
+    token_cache.invalidate_user(instance.id)
+
+
+@post_delete(User)
+async def _invalidate_on_delete(sender, instance, using_db) -> None:
+    token_cache.invalidate_user(instance.id)
@@ -0,0 +1,232 @@
+"""
+유저별 작성 통계 (총 게시글 수, 작성 일수, 연속 작성, 월별 게시글 수) 를 증분으로 유지한다.
+게시글 작성/수정/삭제 핸들러가 같은 트랜잭션 안에서 post_added / post_removed / post_moved 를 부르고,
+통계가 어긋났을 때는 게시글 테이블에서 한 번에 다시 만든다.
+
+    python -m src.tools.user_stats
+"""
+import asyncio
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from tortoise import Tortoise
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.expressions import F
+from tortoise.functions import Count
+from tortoise.transactions import in_transaction
+
+from src.model.posts import Post
+from src.model.stats import UserDayCount, UserMonthCount, UserStats
+from src.model.users import User
+from src.tools.database import MODELS, WRITE_CONNECTION, tortoise_config
+from src.tools.token_cache import token_cache
+
+DAY_TABLE = "userdaycount"
+MONTH_TABLE = "usermonthcount"
+
+
+def _as_date(value: Union[date, str]) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def _month(day: date) -> str:
+    return f"{day:%Y-%m}"
+
+
+def _streaks(days: Iterable[date]) -> Tuple[int, int, Optional[date]]:
+    """정렬된 작성일 목록에서 (마지막 날짜에서 끝나는 연속 일수, 최장 연속 일수, 마지막 날짜)."""
+    current = longest = 0
+    last: Optional[date] = None
+    for day in days:
+        current = current + 1 if last is not None and day - last == timedelta(days=1) else 1
+        longest = max(longest, current)
+        last = day
+    return current, longest, last
+
+
+def current_streak(stats: UserStats, today: Optional[date] = None) -> int:
+    # 어제까지 이어서 썼으면 아직 오늘 안 썼어도 연속 작성 중으로 본다
+    today = today or date.today()
+    if stats.last_post_date is None or today - stats.last_post_date > timedelta(days=1):
+        return 0
+    return stats.current_streak
+
+
+def writing_rate(stats: UserStats, joined: date, today: Optional[date] = None) -> float:
+    """가입일부터 오늘까지 중 글을 쓴 날의 비율 (%)."""
+    elapsed_days = ((today or date.today()) - joined).days + 1
+    if elapsed_days <= 0:
+        return 0.0
+    return min(stats.days_written / elapsed_days, 1.0) * 100
+
+
+async def _stats_for(conn: BaseDBAsyncClient, user_id: int) -> UserStats:
+    stats = await UserStats.get_or_none(user_id=user_id, using_db=conn)
+    return stats or UserStats(user_id=user_id)
+
+
+async def _recount_streaks(conn: BaseDBAsyncClient, stats: UserStats) -> None:
+    days = await UserDayCount.filter(user_id=stats.user_id).using_db(conn).order_by("date").values_list("date", flat=True)
+    stats.current_streak, stats.longest_streak, stats.last_post_date = _streaks(_as_date(day) for day in days)
+
+
+async def _add_day(conn: BaseDBAsyncClient, user_id: int, day: date) -> bool:
+    """그 날짜의 게시글 수를 1 늘리고, 그 날의 첫 게시글이면 True."""
+    _, rows = await conn.execute_query(
+        f'INSERT INTO "{DAY_TABLE}" ("user_id", "date", "post_count") VALUES (?, ?, 1) '
+        f'ON CONFLICT ("user_id", "date") DO UPDATE SET "post_count" = "post_count" + 1 '
+        f'RETURNING "post_count"',
+        [user_id, day.isoformat()],
+    )
+    first_of_day = rows[0]["post_count"] == 1
+    await conn.execute_query(
+        f'INSERT INTO "{MONTH_TABLE}" ("user_id", "month", "post_count", "days_written") VALUES (?, ?, 1, ?) '
+        f'ON CONFLICT ("user_id", "month") DO UPDATE SET "post_count" = "post_count" + 1, '
+        f'"days_written" = "days_written" + "excluded"."days_written"',
+        [user_id, _month(day), int(first_of_day)],
+    )
+    return first_of_day
+
+
+async def _remove_day(conn: BaseDBAsyncClient, user_id: int, day: date) -> bool:
+    """그 날짜의 게시글 수를 1 줄이고, 그 날의 마지막 게시글이었으면 True."""
+    _, rows = await conn.execute_query(
+        f'UPDATE "{DAY_TABLE}" SET "post_count" = "post_count" - 1 WHERE "user_id" = ? AND "date" = ? '
+        f'RETURNING "post_count"',
+        [user_id, day.isoformat()],
+    )
+    last_of_day = bool(rows) and rows[0]["post_count"] <= 0
+    if last_of_day:
+        await conn.execute_query(f'DELETE FROM "{DAY_TABLE}" WHERE "user_id" = ? AND "date" = ?', [user_id, day.isoformat()])
+    await conn.execute_query(
+        f'UPDATE "{MONTH_TABLE}" SET "post_count" = "post_count" - 1, "days_written" = "days_written" - ? '
+        f'WHERE "user_id" = ? AND "month" = ?',
+        [int(last_of_day), user_id, _month(day)],
+    )
+    await conn.execute_query(
+        f'DELETE FROM "{MONTH_TABLE}" WHERE "user_id" = ? AND "month" = ? AND "post_count" <= 0',
+        [user_id, _month(day)],
+    )
+    return last_of_day
+
+
+async def _count_posts(conn: BaseDBAsyncClient, stats: UserStats, delta: int) -> None:
+    stats.total_posts = max(stats.total_posts + delta, 0)
+    await User.filter(id=stats.user_id).using_db(conn).update(number_of_posts=F("number_of_posts") + delta)
+    # queryset update 는 post_save 시그널을 보내지 않으므로 토큰 캐시의 User 스냅샷을 직접 지움
+    token_cache.invalidate_user(stats.user_id)
+
+
+async def _day_added(conn: BaseDBAsyncClient, stats: UserStats, day: date) -> None:
+    stats.days_written += 1
+    last = stats.last_post_date
+    if last is not None and day < last:
+        # 지난 날짜를 채워 넣으면 앞뒤 구간이 이어질 수 있으므로 작성일 목록으로 다시 계산
+        await _recount_streaks(conn, stats)
+        return
+    stats.current_streak = stats.current_streak + 1 if last is not None and day - last == timedelta(days=1) else 1
+    stats.longest_streak = max(stats.longest_streak, stats.current_streak)
+    stats.last_post_date = day
+
+
+async def post_added(conn: BaseDBAsyncClient, user_id: int, post_date: date) -> None:
+    stats = await _stats_for(conn, user_id)
+    await _count_posts(conn, stats, 1)
+    if await _add_day(conn, user_id, post_date):
+        await _day_added(conn, stats, post_date)
+    await stats.save(using_db=conn)
+
+
+async def post_removed(conn: BaseDBAsyncClient, user_id: int, post_date: date) -> None:
+    stats = await _stats_for(conn, user_id)
+    await _count_posts(conn, stats, -1)
+    if await _remove_day(conn, user_id, post_date):
+        stats.days_written = max(stats.days_written - 1, 0)
+        await _recount_streaks(conn, stats)
+    await stats.save(using_db=conn)
+
+
+async def post_moved(conn: BaseDBAsyncClient, user_id: int, old_date: date, new_date: date) -> None:
+    if old_date == new_date:
+        return
+    stats = await _stats_for(conn, user_id)
+    removed_day = await _remove_day(conn, user_id, old_date)
+    added_day = await _add_day(conn, user_id, new_date)
+    stats.days_written += int(added_day) - int(removed_day)
+    if removed_day or added_day:
+        await _recount_streaks(conn, stats)
+    await stats.save(using_db=conn)
+
+
+def _build_rows(day_rows: Sequence[Tuple[int, Union[date, str], int]]):
+    """(user_id, date, post_count) 를 user_id, date 순으로 받아 세 테이블의 row 를 만든다."""
+    stats_rows: List[UserStats] = []
+    day_counts: List[UserDayCount] = []
+    month_counts: List[UserMonthCount] = []
+    index = 0
+    while index < len(day_rows):
+        user_id = day_rows[index][0]
+        days: List[date] = []
+        months = {}
+        total = 0
+        while index < len(day_rows) and day_rows[index][0] == user_id:
+            _, raw_day, post_count = day_rows[index]
+            day = _as_date(raw_day)
+            days.append(day)
+            total += post_count
+            day_counts.append(UserDayCount(user_id=user_id, date=day, post_count=post_count))
+            month = months.setdefault(_month(day), UserMonthCount(user_id=user_id, month=_month(day)))
+            month.post_count += post_count
+            month.days_written += 1
+            index += 1
+        current, longest, last = _streaks(days)
+        stats_rows.append(UserStats(
+            user_id=user_id,
+            total_posts=total,
+            days_written=len(days),
+            current_streak=current,
+            longest_streak=longest,
+            last_post_date=last,
+        ))
+        month_counts.extend(months.values())
+    return stats_rows, day_counts, month_counts
+
+
+async def rebuild_stats(conn: BaseDBAsyncClient, batch_size: int = 1000) -> int:
+    """게시글 테이블을 날짜별로 한 번 GROUP BY 해서 모든 유저의 통계를 다시 만든다. 통계를 만든 유저 수를 반환."""
+    day_rows = await (
+        Post.all()
+        .using_db(conn)
+        .annotate(post_count=Count("id"))
+        .group_by("author_id", "date")
+        .order_by("author_id", "date")
+        .values_list("author_id", "date", "post_count")
+    )
+    stats_rows, day_counts, month_counts = _build_rows(day_rows)
+
+    for model in (UserStats, UserDayCount, UserMonthCount):
+        await model.all().using_db(conn).delete()
+    await UserStats.bulk_create(stats_rows, batch_size=batch_size, using_db=conn)
+    await UserDayCount.bulk_create(day_counts, batch_size=batch_size, using_db=conn)
+    await UserMonthCount.bulk_create(month_counts, batch_size=batch_size, using_db=conn)
+    await conn.execute_query(
+        'UPDATE "user" SET "number_of_posts" = (SELECT COUNT(*) FROM "post" WHERE "post"."author_id" = "user"."id")'
+    )
+    token_cache.clear()
+    return len(stats_rows)
+
+
+async def _repair() -> None:
+    from config import database_url
+    from src.tools.migrate import migrate
+
+    await Tortoise.init(config=tortoise_config(database_url, MODELS))
+    await migrate()
+    async with in_transaction(WRITE_CONNECTION) as conn:
+        count = await rebuild_stats(conn)
+    print(f"Rebuilt writing stats for {count} users")
+    await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    asyncio.run(_repair())
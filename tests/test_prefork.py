@@ -0,0 +1,111 @@
+"""
+prefork 마스터가 죽은 워커를 다시 띄우고, SIGHUP 때 모든 워커를 새 세대로 교체하는지 확인.
+워커 상태는 /health 와 같은 worker_stats() 를 돌려주는 작은 앱을 띄워서 본다.
+
+    python -m pytest tests/test_prefork.py
+"""
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 마스터 프로세스로 실행할 코드. 워커는 lifespan 에서 준비 표시 + heartbeat 를 하고, 요청에는 worker_stats() 로 답함
+SERVER = """
+import asyncio, json, sys
+from src.tools.prefork import heartbeat, mark_ready, serve, worker_stats
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await receive()
+        task = asyncio.create_task(heartbeat())
+        mark_ready()
+        await send({"type": "lifespan.startup.complete"})
+        await receive()
+        task.cancel()
+        await send({"type": "lifespan.shutdown.complete"})
+        return
+    body = json.dumps(worker_stats()).encode()
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": body})
+
+serve(app, preload=lambda: None, workers=2, host="127.0.0.1", port=int(sys.argv[1]))
+"""
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="prefork needs os.fork")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _workers(port: int) -> list:
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=2) as response:
+            stats = json.load(response)
+    except OSError:
+        return []
+    return [worker for worker in stats["workers"] if worker["ready"]]
+
+
+def _wait_for(port: int, predicate, timeout: float = 20.0) -> list:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        workers = _workers(port)
+        if predicate(workers):
+            return workers
+        time.sleep(0.1)
+    raise AssertionError(f"timed out waiting for workers, last seen: {_workers(port)}")
+
+
+@pytest.fixture
+def master():
+    port = _free_port()
+    env = {**os.environ, "WORKER_GRACEFUL_TIMEOUT_SECONDS": "2"}
+    process = subprocess.Popen([sys.executable, "-c", SERVER, str(port)], cwd=ROOT, env=env)
+    try:
+        yield process, port
+    finally:
+        if process.poll() is None:
+            process.send_signal(signal.SIGTERM)
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+def test_killed_worker_is_replaced(master):
+    process, port = master
+    workers = _wait_for(port, lambda workers: len(workers) == 2)
+    killed = workers[0]["pid"]
+    os.kill(killed, signal.SIGKILL)
+
+    workers = _wait_for(port, lambda workers: len(workers) == 2 and killed not in {w["pid"] for w in workers})
+    assert workers[0]["pid"] != workers[1]["pid"]
+    assert process.poll() is None
+
+
+def test_sighup_replaces_every_worker(master):
+    process, port = master
+    before = {worker["pid"] for worker in _wait_for(port, lambda workers: len(workers) == 2)}
+    process.send_signal(signal.SIGHUP)
+
+    # 교체 중에는 새 워커와 기존 워커가 같이 보이므로, 기존 워커가 모두 내려가고 새 세대 2개만 남을 때까지 기다림
+    workers = _wait_for(
+        port,
+        lambda workers: len(workers) == 2 and all(w["generation"] == 1 for w in workers),
+    )
+    assert not before & {worker["pid"] for worker in workers}
+
+    process.send_signal(signal.SIGTERM)
+    assert process.wait(timeout=15) == 0